@@ -9,7 +9,10 @@ lenses and encapsulates (and hides) much of the complexity of the framework
 whilst allowed us to extend it.
 """
 import inspect
+import re
+import sys
 
+from .charsets import charset_pattern, charset_table
 from .containers import AbstractContainer, ContainerFactory, LensObject
 from .debug import IN_DEBUG_MODE, assert_msg, d
 from .exceptions import (
@@ -21,7 +24,12 @@ from .exceptions import (
 )
 from .item import enable_meta_data, list_wrapper
 from .readers import ConcreteInputReader
-from .rollback import Rollbackable, automatic_rollback, get_rollbackables_state
+from .rollback import (
+    Rollbackable,
+    automatic_rollback,
+    get_rollbackables_state,
+    set_rollbackables_state,
+)
 from .settings import GlobalSettings
 from .util import Properties, escape_for_display, has_value, range_truncate, truncate
 
@@ -29,6 +37,24 @@ from .util import Properties, escape_for_display, has_value, range_truncate, tru
 # Base Lens
 #########################################################
 
+# Returned by Lens._try_get() when the lens fails to GET.
+FAILED = object()
+
+
+class LensOptions(Properties):
+    """
+    The options of a lens.  Options read by the framework default to None on the
+    class, since reading an unset option would otherwise fall back on
+    __getattr__ (after an internal AttributeError), which is slow.
+    """
+
+    label = None
+    is_label = None
+    alignment = None
+    auto_list = None
+    combine_chars = None
+    cache = None
+
 
 class Lens:
     """Base lens, which all other lenses extend."""
@@ -45,7 +71,9 @@ class Lens:
             functionality in an extendible way.  For example, we might use this to
             specify how we align data items to their original position in the
             source string, perhaps by some label, their original position, or by
-            some order in the native type.
+            some order in the native type.  Setting cache=True memoises the
+            lens' GET at each input position (see _get_memoised), whilst
+            cache=False opts out of GlobalSettings.memoize_parse.
         """
         self.type = type
 
@@ -67,7 +95,7 @@ class Lens:
 
         # Allow arbitrary arguments to be set on the lens which can aid flexible
         # storage and retrival of items from a container.
-        self.options = Properties(**options)
+        self.options = LensOptions(**options)
 
         #
         # Argument shortcuts
@@ -78,6 +106,16 @@ class Lens:
         if not has_value(self.type) and (self.options.is_label or self.options.label):
             self.type = str
 
+        # Intern a static label, since it is compared with the labels of items when
+        # choosing which to PUT, so equal labels will usually be identical.
+        if self.options.label.__class__ is str:
+            self.options.label = sys.intern(self.options.label)
+
+        # The container class for our type, and the type it was found for (see
+        # _create_lens_container).
+        self._container_class = None
+        self._container_class_type = None
+
     def get(self, concrete_input, current_container=None):
         """
         Returns a data item from the string *concrete_input* according to this
@@ -118,9 +156,14 @@ class Lens:
         #
         # return item
 
-        # Ensure we have the concrete input in the form of a ConcreteInputReader
-        assert_msg(has_value(concrete_input), "Cannot GET if there is no input string!")
-        concrete_input_reader = self._normalise_concrete_input(concrete_input)
+        # Ensure we have the concrete input in the form of a ConcreteInputReader.
+        # Note, sub-lenses are passed the reader that the outermost lens creates,
+        # so we need only normalise a string once, on entry.
+        if concrete_input.__class__ is ConcreteInputReader:
+            concrete_input_reader = concrete_input
+        else:
+            assert concrete_input is not None, "Cannot GET if there is no input string!"
+            concrete_input_reader = self._normalise_concrete_input(concrete_input)
 
         if IN_DEBUG_MODE:
             d(f"Initial state: in={concrete_input_reader}, cont={current_container}")
@@ -128,8 +171,9 @@ class Lens:
         # Remember the start position of the concrete reader, to aid
         # re-alignment of concrete structures when we Lens.put is later called.
         # We will store this in a returned items meta_data, effictively giving it
-        # a lifeline back to where it came from.
-        concrete_start_position = concrete_input_reader.get_pos()
+        # a lifeline back to where it came from.  Note, in this and other hot
+        # paths, we read the reader's position directly, rather than by a call.
+        concrete_start_position = concrete_input_reader.position
 
         # Create an empty appropriate container class for our lens, if there is one;
         # this will be None if we are not a container-type lens (e.g. a dict or
@@ -142,28 +186,38 @@ class Lens:
         # sub-lenses with our own container (lens_container).
         if lens_container:
             # Call GET proper with our container, checking that no item is returned,
-            # since all items should be stored WITHIN the container
-            assert_msg(
-                self._get(concrete_input_reader, lens_container) is None,
-                f"Container lens {self} has GOT an item, but all items must be stored in the current container, not returned.",
-            )
+            # since all items should be stored WITHIN the container.  Note, in this
+            # and other hot paths, we use a plain assert so that the message is
+            # formatted only if the assertion fails.
+            got_item = self._get(concrete_input_reader, lens_container)
+            assert (
+                got_item is None
+            ), f"Container lens {self} has GOT an item, but all items must be stored in the current container, not returned."
 
             # Since we created the container, we will return it as our item, for a
             # higher order lens to store.
             item = lens_container.unwrap()
 
+        # If there is no outer container to store items in, a cached lens may reuse
+        # the outcome of an earlier GET at this input position.
+        elif current_container is None and (
+            self.options.cache
+            or (GlobalSettings.memoize_parse and self.options.cache is None)
+        ):
+            item = self._get_memoised(concrete_input_reader)
+
         # Otherwise, call GET proper using the outer container, if there is one.
         else:
             item = self._get(concrete_input_reader, current_container)
 
         # If we are a STORE lens (i.e. we extract an item) ...
-        if self.has_type():
+        # Note, has_type() is inlined in the GET and PUT paths, which are hot.
+        if self.type is not None:
             # Cast the item to our type (usually if it is a string being cast to a
             # simple type, such as int).
-            assert_msg(
-                has_value(item),
-                f"Somethings gone wrong: {self} is a STORE lens, so we should have got an item.",
-            )
+            assert (
+                item is not None
+            ), f"Somethings gone wrong: {self} is a STORE lens, so we should have got an item."
             if not isinstance(item, self.type):
                 item = self.type(item)
 
@@ -178,11 +232,12 @@ class Lens:
 
             # A reference to the lens that extracted the item.
             item._meta_data.lens = self
-            d(f"Set meta on {item} to {item._meta_data}")
+            if IN_DEBUG_MODE:
+                d(f"Set meta on {item} to {item._meta_data}")
 
             # A reference to the concrete reader and position parsed from.
             item._meta_data.concrete_start_position = concrete_start_position
-            item._meta_data.concrete_end_position = concrete_input_reader.get_pos()
+            item._meta_data.concrete_end_position = concrete_input_reader.position
             item._meta_data.concrete_input_reader = concrete_input_reader
 
             # If the item was unwrapped from a container, update meta with label
@@ -208,9 +263,10 @@ class Lens:
             else:
                 d("GOT: NOTHING (to store)")
 
-        # If appropriate, check the input was fully consumed by this lens
+        # If appropriate, check the input was fully consumed by this lens (i.e. if
+        # we were passed a string, rather than a reader).
         if (
-            isinstance(concrete_input, str)
+            concrete_input_reader is not concrete_input
             and GlobalSettings.check_consumption
             and not concrete_input_reader.is_fully_consumed()
         ):
@@ -219,8 +275,10 @@ class Lens:
                 f"'{concrete_input_reader.get_remaining()}'"
             )
 
-        # Pre-process outgoing item.
-        item = self._process_outgoing_item(item)
+        # Pre-process outgoing item (there is nothing to process if there is no item,
+        # as for most non-store lenses).
+        if item is not None:
+            item = self._process_outgoing_item(item)
 
         return item
 
@@ -334,7 +392,7 @@ class Lens:
         # either return the default output string, if it has one; or it will
         # generate some output internally, perhaps from the input or from the
         # default output of a sub-lens.
-        if not self.has_type():
+        if self.type is None:
             # Use default (for CREATE)
             if concrete_input_reader is None and has_value(self.default):
                 output = str(self.default)
@@ -484,6 +542,39 @@ class Lens:
 
         return output
 
+    def _try_get(self, concrete_input_reader, current_container=None):
+        """
+        As get(), but returns FAILED rather than raising a LensException if the
+        lens fails, which lenses that may try something else on failure (e.g. Or)
+        use to save raising and catching exceptions.  Lenses may overload this
+        with a cheaper test, in which case, as with get(), the state need not be
+        rolled back on failure.
+        """
+        try:
+            return self.get(concrete_input_reader, current_container)
+        except LensException:
+            return FAILED
+
+    def _gets_directly(self, current_container):
+        """
+        Returns whether get() would simply call our GET proper and return its
+        outcome, as for a non-store lens whose outcome is not memoised, in which
+        case _try_get() may do likewise without raising an exception on failure.
+        """
+        options = self.options
+        return (
+            self.type is None
+            and not options.is_label
+            and options.label is None
+            and (
+                current_container is not None
+                or not (
+                    options.cache
+                    or (GlobalSettings.memoize_parse and options.cache is None)
+                )
+            )
+        )
+
     def get_and_discard(self, concrete_input, current_container):
         """
         Sometimes we wish to consume input but discard any items GOTten.
@@ -520,19 +611,37 @@ class Lens:
             current_container.get_and_store_item(lens, concrete_input_reader)
         else:
             # Call get on lens passing no container, checking it returns no item.
-            assert_msg(
-                lens.get(concrete_input_reader, None) is None,
+            item = lens.get(concrete_input_reader, None)
+            assert item is None, (
                 "The untyped container lens %s did not expect the sub-lens %s to return an item"
-                % (self, lens),
+                % (self, lens)
             )
 
+    def container_try_get(self, lens, concrete_input_reader, current_container):
+        """
+        As container_get(), but returns FAILED rather than raising a
+        LensException if the lens fails (in which case, as with _try_get(), the
+        state need not be rolled back).
+        """
+        item = lens._try_get(concrete_input_reader, current_container)
+        if item is FAILED or item is None:
+            return item
+
+        assert current_container is not None, (
+            "The untyped container lens %s did not expect the sub-lens %s to return an item"
+            % (self, lens)
+        )
+        try:
+            current_container.store_got_item(item, lens, concrete_input_reader)
+        except LensException:
+            return FAILED
+
     def container_put(self, lens, concrete_input_reader, current_container):
         """Reciprocal of container_get."""
         if lens.has_type():
-            assert_msg(
-                has_value(current_container),
+            assert current_container is not None, (
                 "Lens %s expected an enclosing container from which to pluck an item."
-                % lens,
+                % lens
             )
             return current_container.consume_and_put_item(lens, concrete_input_reader)
         else:
@@ -552,10 +661,141 @@ class Lens:
         for new_sublens in new_sublenses:
             self.lenses.append(self._preprocess_lens(new_sublens))
 
+    def freeze(self):
+        """
+        Specialises the GET of this lens, once it is fully defined (e.g. any
+        Forward lenses are bound), by compiling each part of it that stores no
+        items into a single regular expression, which then GETs that part in one
+        match rather than by descending through its sub-lenses.  Note, the lens
+        should not be altered after it is frozen.  Returns the lens itself.
+        """
+        # The regexes rely on atomic groups and possessive quantifiers, which
+        # Python supports from 3.11, so before that we leave the lens as it is.
+        if sys.version_info >= (3, 11):
+            self._freeze({}, set())
+        return self
+
     #
     # Helper methods.
     #
 
+    def _get_first_chars(self):
+        """
+        Returns the set of chars with which any input GOT by this lens must begin
+        (except that the lens may also match at the end of the input), or None if
+        this is not known, such as for a lens that may match the empty string.
+        Lenses such as Until use this to skip input this lens cannot match.
+        """
+        return None
+
+    def _get_token_pattern(self):
+        """
+        Returns a compiled regex, without groups, that matches at the current
+        position just when this lens would GET, consuming just what it would (as
+        a single token), or None if the lens GETs otherwise.  Lenses such as Or
+        use this to match a choice of such lenses at once.
+        """
+        return None
+
+    def _get_pattern(self, sub_patterns):
+        """
+        Returns a regex that matches just what this lens GETs, given such
+        regexes for our sub-lenses (None where there is none), or None if the
+        lens stores items or cannot be expressed as a regex.  Note, since GET
+        never backtracks into a lens that has succeeded, the regex should match
+        atomically.
+        """
+        return None
+
+    def _get_tree_pattern(self, patterns):
+        """
+        Returns our regex (see _get_pattern), working out those of our sub-lenses,
+        where patterns collects the regex of each lens visited, keyed by its id.
+        """
+        if id(self) in patterns:
+            return patterns[id(self)]
+
+        # Guard against recursing through a Forward lens back to ourself.
+        patterns[id(self)] = None
+        sub_patterns = [lens._get_tree_pattern(patterns) for lens in self.lenses]
+
+        # Note, if a subclass GETs differently from the class that gives our
+        # regex, that regex will not do.
+        pattern = None
+        lens_class = self.__class__
+        for pattern_class in lens_class.__mro__:
+            if "_get_pattern" in vars(pattern_class):
+                if pattern_class._get is lens_class._get:
+                    pattern = self._get_pattern(sub_patterns)
+                break
+        patterns[id(self)] = pattern
+        return pattern
+
+    def _freeze(self, patterns, frozen):
+        """
+        Freezes this lens and its sub-lenses (see freeze), where patterns is as
+        for _get_tree_pattern and frozen collects the ids of the lenses visited.
+        """
+        if id(self) in frozen:
+            return
+        frozen.add(id(self))
+        for lens in self.lenses:
+            lens._freeze(patterns, frozen)
+
+        # Lenses without sub-lenses already GET cheaply, so need no regex of
+        # their own.
+        pattern = self._get_tree_pattern(patterns)
+        if pattern is not None and self.lenses:
+            self._frozen_pattern = re.compile(pattern)
+            self._get = self._get_frozen
+            self._try_get = self._try_get_frozen
+
+    def _get_frozen(self, concrete_input_reader, current_container):
+        """GET proper of a frozen lens."""
+        match = self._frozen_pattern.match(
+            concrete_input_reader.string, concrete_input_reader.position
+        )
+        if match is None:
+            raise LensException(f"Expected to GET {self}")
+        concrete_input_reader.position = match.end()
+
+    def _try_get_frozen(self, concrete_input_reader, current_container=None):
+        """As _get_frozen, but returns FAILED rather than raising."""
+        match = self._frozen_pattern.match(
+            concrete_input_reader.string, concrete_input_reader.position
+        )
+        if match is None:
+            return FAILED
+        concrete_input_reader.position = match.end()
+
+    def _get_memoised(self, concrete_input_reader):
+        """
+        Calls GET proper, memoising its outcome at the current input position
+        (i.e. packrat parsing), so that the same input need not be re-parsed when
+        lenses such as Until, Or and Forward try this lens there again.  Only
+        outcomes that cannot be changed by the caller are memoised: a failure, or
+        a result of nothing or a plain string (which get() wraps afresh).
+        """
+        parse_cache = concrete_input_reader.parse_cache
+        key = (self, concrete_input_reader.position)
+        memo = parse_cache.get(key)
+        if memo is not None:
+            end_position, item, exception = memo
+            if exception is not None:
+                raise exception.with_traceback(None)
+            concrete_input_reader.position = end_position
+            return item
+
+        try:
+            item = self._get(concrete_input_reader, None)
+        except LensException as e:
+            parse_cache[key] = (None, None, e)
+            raise
+
+        if item is None or item.__class__ is str:
+            parse_cache[key] = (concrete_input_reader.position, item, None)
+        return item
+
     def _normalise_concrete_input(self, concrete_input):
         """If a string is passed, ensure it is normalised to a ConcreteInputReader."""
         if not has_value(concrete_input):
@@ -564,15 +804,24 @@ class Lens:
         if isinstance(concrete_input, str):
             concrete_input = ConcreteInputReader(concrete_input)
 
-        assert_msg(
-            isinstance(concrete_input, ConcreteInputReader),
-            f"Expected to have a ConcreteInputReader not a {type(concrete_input)}",
-        )
+        assert isinstance(
+            concrete_input, ConcreteInputReader
+        ), f"Expected to have a ConcreteInputReader not a {type(concrete_input)}"
         return concrete_input
 
     def _create_lens_container(self):
         """Creates a container for this lens, if the lens is of a container type."""
-        return ContainerFactory.create_container(self.type)
+        lens_type = self.type
+        if lens_type is None:
+            return None
+
+        # Look up our container class once, rather than on every GET and PUT,
+        # though our type may since have been reassigned.
+        if lens_type is not self._container_class_type:
+            self._container_class = ContainerFactory.get_container_class(lens_type)
+            self._container_class_type = lens_type
+
+        return ContainerFactory.create_container_of_class(self._container_class)
 
     # XXX: I don't really like these forward declarations, but for now this does
     # the job.  Perhaps lenses can be registered with the framework for more
@@ -594,11 +843,20 @@ class Lens:
                 hasattr(lens_operand, "__lens__"),
                 f"LensObject {lens_operand} defines no __lens__ variable",
             )
+            # Reuse the lens last coerced from this class's (not a base class's)
+            # __lens__, so it is built, and its lazily-built state (e.g. its
+            # dispatch tables) is kept, for every use of the class, unless
+            # __lens__ has since been reassigned.
+            class_lens = lens_operand.__lens__
+            coerced_lens = vars(lens_operand).get("_coerced_lens")
+            if coerced_lens is not None and coerced_lens[0] is class_lens:
+                return coerced_lens[1]
+
             # Note, we also coerce __lens__ to a lens, just for completeness (e.g. if
             # lens was simply a string, it would be coerced to a Literal lens.
-            lens_operand = Group(
-                Lens._coerce_to_lens(lens_operand.__lens__), type=lens_operand
-            )
+            group = Group(Lens._coerce_to_lens(class_lens), type=lens_operand)
+            lens_operand._coerced_lens = (class_lens, group)
+            return group
 
         assert_msg(
             isinstance(lens_operand, Lens),
@@ -628,42 +886,38 @@ class Lens:
         a single item.
         """
 
-        # This allows a list singleton to be returned as a single item, for
-        # convenience.
-        if (
-            self.options.auto_list is True
-            and self.has_type()
-            and issubclass(self.type, list)
-            and len(item) == 1
-        ):
-            # The easy part is extracting a singleton from the list, but we must
-            # also preserve the source meta data of the list item by piggybacking it onto
-            # the extracted item's meta data
-
-            list_meta_data = item._meta_data
-            singleton_meta_data = item[0]._meta_data
-            item = item[0]
-            item._meta_data = list_meta_data
-            item._meta_data.singleton_meta_data = singleton_meta_data
-
-        # This allows a list of chars to be combined into a string.
-        elif (
-            self.options.combine_chars
-            and self.has_type()
-            and issubclass(self.type, list)
-        ):
-            # Note, care should be taken to use this only when a list of single chars is used.
-            # XXX: Note, we actually loose each char's meta data here, but this should not be a problem in most cases.
-            original_meta = item._meta_data
-            item = enable_meta_data("".join(item))
-            item._meta_data = original_meta
+        options = self.options
+
+        # Only list lenses may unwrap or combine their items, so other lenses (most
+        # of them) need not check for auto_list or combine_chars.
+        lens_type = self.type
+        if lens_type is not None and issubclass(lens_type, list):
+            # This allows a list singleton to be returned as a single item, for
+            # convenience.
+            if options.auto_list is True and len(item) == 1:
+                # The easy part is extracting a singleton from the list, but we must
+                # also preserve the source meta data of the list item by piggybacking it onto
+                # the extracted item's meta data
+
+                list_meta_data = item._meta_data
+                item = item[0]
+                list_meta_data.singleton_meta_data = item._meta_data
+                item._meta_data = list_meta_data
+
+            # This allows a list of chars to be combined into a string.
+            elif options.combine_chars:
+                # Note, care should be taken to use this only when a list of single chars is used.
+                # XXX: Note, we actually loose each char's meta data here, but this should not be a problem in most cases.
+                original_meta = item._meta_data
+                item = enable_meta_data("".join(item))
+                item._meta_data = original_meta
 
         # Mark if this item is to be used AS a label.
-        if self.options.is_label:
+        if options.is_label:
             item._meta_data.is_label = True
         # Mark the item to have a static label.
-        elif has_value(self.options.label):
-            item._meta_data.label = self.options.label
+        elif options.label is not None:
+            item._meta_data.label = options.label
 
         return item
 
@@ -805,8 +1059,24 @@ class And(Lens):
             else:
                 self.extend_sublenses([lens])
 
+        # Our sub-lenses, with runs of non-store lenses merged, once we are frozen.
+        self._frozen_steps = None
+
+        # If we are a sequence of token lenses (e.g. a separator such as WS("") +
+        # "," + WS(" ")), matches them all at once (see _get_sequence_pattern),
+        # or is False if we are not (both found on first use).
+        self._token_pattern = None
+
     def _get(self, concrete_input_reader, current_container):
         """Sequential GET on each lens."""
+        # A sequence of non-store tokens stores nothing, so we can GET it in one
+        # match.
+        sequence_pattern = self._get_sequence_pattern()
+        if sequence_pattern is not None:
+            if concrete_input_reader.consume_match(sequence_pattern) is None:
+                raise LensException(f"Expected to GET {self}")
+            return
+
         for lens in self.lenses:
             self.container_get(lens, concrete_input_reader, current_container)
 
@@ -814,14 +1084,35 @@ class And(Lens):
         # container, that the Lens class sets up for us in Lens.get regardless if our
         # lens created the container or not.
 
+    def _try_get(self, concrete_input_reader, current_container=None):
+        # If get() would simply GET each of our lenses in turn, we can try them
+        # ourselves, and so fail without raising an exception.
+        if self.__class__._get is not And._get or not self._gets_directly(
+            current_container
+        ):
+            return super()._try_get(concrete_input_reader, current_container)
+
+        sequence_pattern = self._get_sequence_pattern()
+        if sequence_pattern is not None:
+            if concrete_input_reader.consume_match(sequence_pattern) is None:
+                return FAILED
+            return None
+
+        container_try_get = self.container_try_get
+        for lens in self._frozen_steps or self.lenses:
+            if (
+                container_try_get(lens, concrete_input_reader, current_container)
+                is FAILED
+            ):
+                return FAILED
+
     def _put(self, item, concrete_input_reader, current_container):
         """Sequential PUT on each lens."""
         # In the same way that we do not return an item in GET, we do not expect
         # to PUT an individual item; again, this is handle in Lens.put
-        assert_msg(
-            item is None,
-            f"Lens {self} did not expect to PUT an individual item {item}, since it PUTs from a container",
-        )
+        assert (
+            item is None
+        ), f"Lens {self} did not expect to PUT an individual item {item}, since it PUTs from a container"
 
         # Simply concatenate output from the sub-lenses.
         output = ""
@@ -830,6 +1121,79 @@ class And(Lens):
 
         return output
 
+    def _get_token_pattern(self):
+        return self._get_sequence_pattern() if self.type is None else None
+
+    def _get_sequence_pattern(self):
+        """
+        Returns a compiled regex that matches our lenses just as they would GET
+        one after another, if they are all non-store token lenses, otherwise
+        None.  Note, since the type of a lens may be set at any time, we check
+        their types on each call.
+        """
+        token_pattern = self._token_pattern
+        if token_pattern is False:
+            return None
+        for lens in self.lenses:
+            if lens.type is not None:
+                return None
+
+        if token_pattern is None:
+            # Each token is matched atomically, as its lens would GET it, which
+            # needs Python 3.11.
+            token_patterns = [lens._get_token_pattern() for lens in self.lenses]
+            if (
+                sys.version_info < (3, 11)
+                or self.__class__._get is not And._get
+                or not self.lenses
+                or None in token_patterns
+            ):
+                self._token_pattern = False
+                return None
+            token_pattern = self._token_pattern = re.compile(
+                "".join(f"(?>{pattern.pattern})" for pattern in token_patterns)
+            )
+        return token_pattern
+
+    def _get_first_chars(self):
+        # Note, the first lens cannot match the empty string if it knows its chars.
+        return self.lenses[0]._get_first_chars() if self.lenses else None
+
+    def _get_pattern(self, sub_patterns):
+        if self.type is not None or None in sub_patterns:
+            return None
+        return "".join(sub_patterns)
+
+    def _freeze(self, patterns, frozen):
+        super()._freeze(patterns, frozen)
+
+        # If we store items, we can still GET each run of our non-store
+        # sub-lenses with a single match, rather than one lens at a time.
+        if patterns[id(self)] is None and self.__class__._get is And._get:
+            steps, run = [], []
+            for lens in self.lenses + [None]:
+                if lens is not None and patterns[id(lens)] is not None:
+                    run.append(lens)
+                    continue
+                if len(run) > 1:
+                    run_lens = And(*run)
+                    run_lens._freeze(patterns, frozen)
+                    steps.append(run_lens)
+                else:
+                    steps.extend(run)
+                run = []
+                if lens is not None:
+                    steps.append(lens)
+
+            if len(steps) < len(self.lenses):
+                self._frozen_steps = steps
+                self._get = self._get_frozen_steps
+
+    def _get_frozen_steps(self, concrete_input_reader, current_container):
+        """GET proper of a frozen lens, with its non-store runs merged."""
+        for lens in self._frozen_steps:
+            self.container_get(lens, concrete_input_reader, current_container)
+
 
 class Or(Lens):
     """
@@ -847,6 +1211,15 @@ class Or(Lens):
             else:
                 self.extend_sublenses([lens])
 
+        # Maps a next input char to the lenses that may match from it, and lists
+        # those that may match from any other char (both built on first use).
+        self._dispatch_table = None
+        self._other_char_lenses = None
+
+        # If our lenses each GET a single token (e.g. literals), matches the
+        # first of them to match, capturing it in the group of that lens.
+        self._tokens_pattern = None
+
     def _get(self, concrete_input_reader, current_container):
         """
         Calls get on each lens until the firstmost succeeds.
@@ -854,14 +1227,85 @@ class Or(Lens):
         Note that the lens should be designed accordingly to break ties over
         multiple valid paths.
         """
-        for lens in self.lenses:
-            try:
-                with automatic_rollback(concrete_input_reader, current_container):
-                    return lens.get(concrete_input_reader, current_container)
-            except LensException:
-                pass
+        lenses = self._get_lenses_to_try(concrete_input_reader)
 
-        raise LensException("We should have GOT one of the lenses.")
+        # With a single lens (e.g. a plain Whitespace), there is nothing to try
+        # next, so we need not roll back here if it fails: whoever handles the
+        # failure will roll back.
+        if len(lenses) == 1:
+            return lenses[0].get(concrete_input_reader, current_container)
+
+        item = self._try_lenses(lenses, concrete_input_reader, current_container)
+        if item is FAILED:
+            raise LensException("We should have GOT one of the lenses.")
+        return item
+
+    def _try_get(self, concrete_input_reader, current_container=None):
+        # If get() would simply try our lenses, we can try them ourselves, and so
+        # fail without raising an exception.
+        if self.__class__._get is not Or._get or not self._gets_directly(
+            current_container
+        ):
+            return super()._try_get(concrete_input_reader, current_container)
+
+        lenses = self._get_lenses_to_try(concrete_input_reader)
+        if len(lenses) == 1:
+            return lenses[0]._try_get(concrete_input_reader, current_container)
+        return self._try_lenses(lenses, concrete_input_reader, current_container)
+
+    def _try_lenses(self, lenses, concrete_input_reader, current_container):
+        """
+        Returns the item GOT by the first of the lenses to succeed, rolling back
+        the state after each that fails, or FAILED if none succeed.
+        """
+        for lens in lenses:
+            start_state = get_rollbackables_state(
+                concrete_input_reader, current_container
+            )
+            item = lens._try_get(concrete_input_reader, current_container)
+            if item is not FAILED:
+                return item
+            set_rollbackables_state(start_state, concrete_input_reader, current_container)
+
+        return FAILED
+
+    def _get_lenses_to_try(self, concrete_input_reader):
+        """
+        Returns, in order, those of our lenses that may match from the next input
+        char, so that we need not try (and roll back) those that cannot.
+        """
+        if self._dispatch_table is None:
+            first_chars = [lens._get_first_chars() for lens in self.lenses]
+            self._other_char_lenses = [
+                lens for lens, chars in zip(self.lenses, first_chars) if chars is None
+            ]
+            self._dispatch_table = {
+                char: [
+                    lens
+                    for lens, chars in zip(self.lenses, first_chars)
+                    if chars is None or char in chars
+                ]
+                for char in frozenset().union(*filter(None, first_chars))
+            }
+            token_patterns = [lens._get_token_pattern() for lens in self.lenses]
+            if len(self.lenses) > 1 and None not in token_patterns:
+                self._tokens_pattern = re.compile(
+                    "|".join(f"({pattern.pattern})" for pattern in token_patterns)
+                )
+
+        # With only token lenses (e.g. a choice of labels sharing a prefix), a
+        # single match tells us which is the first to match, if any.
+        if self._tokens_pattern is not None:
+            match = self._tokens_pattern.match(
+                concrete_input_reader.string, concrete_input_reader.position
+            )
+            return (self.lenses[match.lastindex - 1],) if match else ()
+
+        # Any lens may match at the end of the input.
+        string, position = concrete_input_reader.string, concrete_input_reader.position
+        if position >= len(string):
+            return self.lenses
+        return self._dispatch_table.get(string[position], self._other_char_lenses)
 
     def _put(self, item, concrete_input_reader, current_container):
         """
@@ -884,6 +1328,10 @@ class Or(Lens):
         #   For lens_b in lenses, lens_b != lens_a
         #     lens.put(input=None)
 
+        # With a single lens, only a straight PUT is possible (as in _get).
+        if len(self.lenses) == 1:
+            return self.lenses[0].put(item, concrete_input_reader, current_container)
+
         # Store the initial state.
         initial_state = get_rollbackables_state(
             concrete_input_reader, current_container
@@ -935,6 +1383,21 @@ class Or(Lens):
 
         raise LensException("We should have PUT one of the lenses.")
 
+    def _get_pattern(self, sub_patterns):
+        # The first lens to match is chosen, which an atomic group ensures.
+        if self.type is not None or not sub_patterns or None in sub_patterns:
+            return None
+        return f"(?>{'|'.join(sub_patterns)})"
+
+    def _get_first_chars(self):
+        first_chars = frozenset()
+        for lens in self.lenses:
+            lens_first_chars = lens._get_first_chars()
+            if lens_first_chars is None:
+                return None
+            first_chars |= lens_first_chars
+        return first_chars
+
     def _display_id(self):
         """For debugging clarity."""
         return " | ".join([str(lens) for lens in self.lenses])
@@ -949,25 +1412,33 @@ class AnyOf(Lens):
     def __init__(self, valid_chars, negate=False, **options):
         super().__init__(**options)
         self.valid_chars, self.negate = valid_chars, negate
+        # A set gives constant time membership tests, however many valid chars.
+        if valid_chars.__class__ is str:
+            self._valid_char_set = charset_table(valid_chars)
+        else:
+            self._valid_char_set = frozenset(valid_chars)
+        self._run_pattern = None
 
     def _get(self, concrete_input_reader, current_container):
         """
         Consumes a valid char from the input, returning it if we are a STORE
         lens.
         """
-        char = None
-        try:
-            char = concrete_input_reader.consume_char()
-            if not self._is_valid_char(char):
-                raise LensException(
-                    f"Expected char {self._display_id()} but got '{truncate(char)}'"
-                )
-        except EndOfStringException:
+        # Note, this inlines consume_char() and _is_valid_char(), since we are
+        # called per char.
+        string, position = concrete_input_reader.string, concrete_input_reader.position
+        if position >= len(string):
             raise LensException(
                 f"Expected char {self._display_id()} but at end of string"
             )
+        char = string[position]
+        if (char in self._valid_char_set) == self.negate:
+            raise LensException(
+                f"Expected char {self._display_id()} but got '{truncate(char)}'"
+            )
+        concrete_input_reader.position = position + 1
 
-        if self.has_type():
+        if self.type is not None:
             return char
         else:
             return None
@@ -1004,12 +1475,45 @@ class AnyOf(Lens):
             )
         return item
 
+    def _try_get(self, concrete_input_reader, current_container=None):
+        # As a non-store lens, we need only check the next char.
+        if self.type is None:
+            string, position = concrete_input_reader.string, concrete_input_reader.position
+            if position >= len(string) or (
+                (string[position] in self._valid_char_set) == self.negate
+            ):
+                return FAILED
+            concrete_input_reader.position = position + 1
+            return None
+        return super()._try_get(concrete_input_reader, current_container)
+
+    def _get_first_chars(self):
+        if self.negate:
+            return None
+        return self._valid_char_set
+
+    def _get_pattern(self, sub_patterns):
+        if self.type is not None:
+            return None
+        return self._get_char_pattern() or "(?!)"
+
+    def _get_char_pattern(self):
+        """Returns a regex matching one valid char, or None if no char is valid."""
+        return charset_pattern(self._valid_char_set, self.negate)
+
+    def _get_run_pattern(self):
+        """Returns a regex matching a run of our valid chars (built on first use)."""
+        if self._run_pattern is None:
+            char_pattern = self._get_char_pattern()
+            self._run_pattern = re.compile(f"{char_pattern}*" if char_pattern else "")
+        return self._run_pattern
+
     def _is_valid_char(self, char):
         """Tests if that passed is a valid character for this lens."""
         if self.negate:
-            return char not in self.valid_chars
+            return char not in self._valid_char_set
         else:
-            return char in self.valid_chars
+            return char in self._valid_char_set
 
     def _display_id(self):
         """To aid debugging."""
@@ -1052,35 +1556,61 @@ class Repeat(Lens):
         # For brevity.
         lens = self.lenses[0]
 
+        # A repeated non-store AnyOf (e.g. of a non-store Word) stores nothing, so
+        # we can consume its run of chars with a single regex match.
+        if lens.__class__ is AnyOf and lens.type is None:
+            position = concrete_input_reader.position
+            pattern = lens._get_run_pattern()
+            end = pattern.match(concrete_input_reader.string, position).end()
+            if has_value(self.max_count):
+                end = min(end, position + self.max_count)
+            concrete_input_reader.position = end
+            self._check_got_count(end - position)
+            return
+
         # For tracking how many successful GETs
         no_got = 0
 
+        # Note, we try the lens, rather than catch the exception it would raise
+        # when it fails, as it eventually must.
+        container_try_get = self.container_try_get
         while True:
-            # Instantiate the rollback context, so we can later check if any state was changed.
-            rollback_context = automatic_rollback(
-                concrete_input_reader, current_container, check_for_state_change=True
+            start_state = get_rollbackables_state(
+                concrete_input_reader, current_container
             )
-            try:
-                with rollback_context:
-                    self.container_get(lens, concrete_input_reader, current_container)
+            if (
+                container_try_get(lens, concrete_input_reader, current_container)
+                is FAILED
+            ):
+                set_rollbackables_state(
+                    start_state, concrete_input_reader, current_container
+                )
+                break
 
-                # If the lens changed no state, then we must break, otherwise continue
-                # for ever.
-                if not rollback_context.some_state_changed:
+            # If the lens changed no state, then we must break, otherwise continue
+            # for ever.
+            if (
+                get_rollbackables_state(
+                    concrete_input_reader, current_container, copy_state=False
+                )
+                == start_state
+            ):
+                if IN_DEBUG_MODE:
                     d(
                         "Lens %s changed no state during this iteration, so we must break out - or spin for ever"
                         % lens
                     )
-                    break
+                break
 
-                no_got += 1
+            no_got += 1
 
-                # Don't get more than maximim
-                if has_value(self.max_count) and no_got == self.max_count:
-                    break
-            except LensException:
+            # Don't get more than maximim
+            if has_value(self.max_count) and no_got == self.max_count:
                 break
 
+        self._check_got_count(no_got)
+
+    def _check_got_count(self, no_got):
         if no_got < self.min_count:
             raise TooFewIterationsException(
                 "Expected at least %s successful GETs but got only %s"
@@ -1134,9 +1664,10 @@ class Repeat(Lens):
                     break
 
                 if not rollback_context.some_state_changed:
-                    d(
-                        f"Lens {lens} changed no state during this iteration, so we must break out - or spin for ever"
-                    )
+                    if IN_DEBUG_MODE:
+                        d(
+                            f"Lens {lens} changed no state during this iteration, so we must break out - or spin for ever"
+                        )
                     break
 
                 output += put
@@ -1183,10 +1714,11 @@ class Repeat(Lens):
                     # If the lens changed no state, then we must break, otherwise continue
                     # forever.
                     if not rollback_context.some_state_changed:
-                        d(
-                            "Lens %s changed no state during this iteration, so we must break out - or spin for ever"
-                            % lens
-                        )
+                        if IN_DEBUG_MODE:
+                            d(
+                                "Lens %s changed no state during this iteration, so we must break out - or spin for ever"
+                                % lens
+                            )
                         break
 
                     no_got += 1
@@ -1210,6 +1742,24 @@ class Repeat(Lens):
 
         return output
 
+    def _get_first_chars(self):
+        if self.min_count == 0:
+            return None
+        return self.lenses[0]._get_first_chars()
+
+    def _get_pattern(self, sub_patterns):
+        # Since we stop at an iteration that consumes nothing, we need our lens to
+        # consume something, except at the end of the input, where we stop.
+        (sub_pattern,) = sub_patterns
+        if (
+            self.type is not None
+            or sub_pattern is None
+            or self.lenses[0]._get_first_chars() is None
+        ):
+            return None
+        max_count = self.max_count if has_value(self.max_count) else ""
+        return rf"(?:(?!\Z){sub_pattern}){{{self.min_count},{max_count}}}+"
+
 
 class Empty(Lens):
     """
@@ -1221,6 +1771,13 @@ class Empty(Lens):
     START_OF_TEXT = "START_OF_TEXT"
     END_OF_TEXT = "END_OF_TEXT"
 
+    # Matches just where we match, in each mode.
+    _TOKEN_PATTERNS = {
+        None: re.compile(""),
+        START_OF_TEXT: re.compile(r"\A"),
+        END_OF_TEXT: re.compile(r"\Z"),
+    }
+
     def __init__(self, mode=None, **options):
         super().__init__(**options)
         self.default = ""
@@ -1262,6 +1819,38 @@ class Empty(Lens):
         # Here goes nothing!
         return ""
 
+    def _try_get(self, concrete_input_reader, current_container=None):
+        # As a non-store lens, we need only check our mode.
+        if self.type is None:
+            if self.mode == self.START_OF_TEXT:
+                if concrete_input_reader.get_pos() != 0:
+                    return FAILED
+            elif self.mode == self.END_OF_TEXT:
+                if not concrete_input_reader.is_fully_consumed():
+                    return FAILED
+            return None
+        return super()._try_get(concrete_input_reader, current_container)
+
+    def _get_pattern(self, sub_patterns):
+        if self.type is not None:
+            return None
+        if self.mode == self.START_OF_TEXT:
+            return r"\A"
+        if self.mode == self.END_OF_TEXT:
+            return r"\Z"
+        return ""
+
+    def _get_token_pattern(self):
+        if self.type is not None:
+            return None
+        return self._TOKEN_PATTERNS.get(self.mode)
+
+    def _get_first_chars(self):
+        # At the end of text we match only at the end of the input, so need no chars.
+        if self.mode == self.END_OF_TEXT:
+            return frozenset()
+        return None
+
 
 class Group(Lens):
     """
@@ -1280,6 +1869,9 @@ class Group(Lens):
     def _put(self, item, concrete_input_reader, current_container):
         return self.lenses[0].put(item, concrete_input_reader, current_container)
 
+    def _get_first_chars(self):
+        return self.lenses[0]._get_first_chars()
+
 
 G = Group
 
@@ -1298,11 +1890,19 @@ class Literal(Lens):
         if not self.has_type():
             self.default = self.literal_string
 
+        # Matches our literal (built on first use).
+        self._token_pattern = None
+
     def _get(self, concrete_input_reader, current_container):
         """
         Consumes a valid char form the input, returning it if we are a STORE
         lens.
         """
+        # Check for a match without slicing the input, otherwise fall through to
+        # report what we got instead.
+        if concrete_input_reader.consume_if_next(self.literal_string):
+            return self.literal_string if self.type is not None else None
+
         input_string = None
         try:
             input_string = concrete_input_reader.consume_string(
@@ -1322,7 +1922,7 @@ class Literal(Lens):
                 % (escape_for_display(self.literal_string))
             )
 
-        if self.has_type():
+        if self.type is not None:
             return input_string
         else:
             return None
@@ -1335,10 +1935,9 @@ class Literal(Lens):
         # If we are not a store lens, simply return what we would consume from the input.
         if not self.has_type():
             # We should not have been passed an item.
-            assert_msg(
-                not has_value(item),
-                f"{self} did not expected to be passed an item - is a non-store lens",
-            )
+            assert (
+                item is None
+            ), f"{self} did not expected to be passed an item - is a non-store lens"
             if has_value(concrete_input_reader):
                 concrete_start_position = concrete_input_reader.get_pos()
                 self._get(concrete_input_reader, current_container)
@@ -1361,6 +1960,28 @@ class Literal(Lens):
 
         return item
 
+    def _try_get(self, concrete_input_reader, current_container=None):
+        # As a non-store lens, we need only check for the literal.
+        if self.type is None:
+            if concrete_input_reader.consume_if_next(self.literal_string):
+                return None
+            return FAILED
+        return super()._try_get(concrete_input_reader, current_container)
+
+    def _get_first_chars(self):
+        return frozenset(self.literal_string[0])
+
+    def _get_token_pattern(self):
+        # Note, we GET the same literal whether or not we store it.
+        if self._token_pattern is None:
+            self._token_pattern = re.compile(re.escape(self.literal_string))
+        return self._token_pattern
+
+    def _get_pattern(self, sub_patterns):
+        if self.type is not None:
+            return None
+        return re.escape(self.literal_string)
+
     def _display_id(self):
         """To aid debugging."""
         # Name is only set after Lens constructor called.
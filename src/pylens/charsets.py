@@ -3,10 +3,37 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import re
 import string
+from functools import lru_cache
 
 # Some useful character sets.
 alphas = string.ascii_lowercase + string.ascii_uppercase
 nums = string.digits
 hexnums = nums + "ABCDEFabcdef"
 alphanums = alphas + nums
+
+
+# Note, these are cached, since lenses such as Word and Keyword create an AnyOf
+# for the same few chars over and over.
+
+
+@lru_cache(maxsize=None)
+def charset_table(chars):
+    """
+    Returns the set of the given chars, for constant time membership tests,
+    which is shared by all lenses of those chars.
+    """
+    return frozenset(chars)
+
+
+@lru_cache(maxsize=None)
+def charset_pattern(char_set, negate=False):
+    """
+    Returns a regex matching one char in (or, if negated, not in) the given set,
+    or None if no char would match.
+    """
+    chars = "".join(re.escape(char) for char in sorted(char_set))
+    if not chars:
+        return r"[\s\S]" if negate else None
+    return f"[{'^' if negate else ''}{chars}]"
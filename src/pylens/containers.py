@@ -3,10 +3,12 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-import copy
+import heapq
 import re
+import sys
+from collections import defaultdict, deque
 
-from pylens.debug import assert_msg
+from pylens.debug import IN_DEBUG_MODE, assert_msg, d
 from pylens.exceptions import LensException, NoTokenToConsumeException
 from pylens.item import enable_meta_data
 from pylens.rollback import Rollbackable, automatic_rollback
@@ -20,9 +22,35 @@ LABEL = "LABEL"
 # Just used to simplify sorting.
 LARGE_INTEGER = 0xFFFFFFFF
 
+# Marks an attribute that did not exist, when journaling attribute changes.
+_MISSING = object()
 
-def d(*args):
-    print(args)
+# The most label mappings we cache per LensObject class, since labels come from
+# the input.
+_CLASS_CACHE_MAX_SIZE = 1024
+
+
+def get_source_position(item):
+    """
+    Returns the position in the concrete input from which an item was GOT, or
+    LARGE_INTEGER for new items, so that they go on the end in SOURCE alignment.
+    """
+    position = item._meta_data.concrete_start_position
+    if position is None:
+        return LARGE_INTEGER
+    return position
+
+
+def _store_in_class_cache(cache, key, value):
+    """Caches a value, evicting the oldest entry if the cache is full."""
+    if len(cache) >= _CLASS_CACHE_MAX_SIZE:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+# Used when mapping labels to and from python identifiers.
+_SPACES_RE = re.compile(r"[ ]+")
+_IDENT_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9_]*$")
 
 
 class AbstractContainer(Rollbackable):
@@ -80,19 +108,24 @@ class AbstractContainer(Rollbackable):
         # Note, here the lens may not have a type, though may still return an item
         # that was GOT from a sub-lens
         item = lens.get(concrete_input_reader, self)
-        if has_value(item):
-            # Note, we check the actual item for is_label rather than the lens that
-            # returned it, since the is_label lens may actually be a sublens.
-            if item._meta_data.is_label:
-                self.set_label(item)  # Store item as label.
-            else:
-                self.store_item(item, lens, concrete_input_reader)
+        # Note, has_value() is inlined in these hot paths, to save a call per item.
+        if item is not None:
+            self.store_got_item(item, lens, concrete_input_reader)
+
+    def store_got_item(self, item, lens, concrete_input_reader):
+        """Stores an item GOT by the lens, or sets it as our label if it is one."""
+        # Note, we check the actual item for is_label rather than the lens that
+        # returned it, since the is_label lens may actually be a sublens.
+        if item._meta_data.is_label:
+            self.set_label(item)  # Store item as label.
+        else:
+            self.store_item(item, lens, concrete_input_reader)
 
     def consume_and_put_item(self, lens, concrete_input_reader):
         """Called by lenses that put items from the container into sub-lenses (e.g. And)."""
         assert lens.has_type()
         assert_msg(
-            has_value(self._container_lens),
+            self._container_lens is not None,
             "Our container has not been associated with a container type lens.",
         )
 
@@ -109,7 +142,8 @@ class AbstractContainer(Rollbackable):
         # Get candidates to PUT
         candidates = self.get_put_candidates(lens, concrete_input_reader)
 
-        d(f"Unfiltered candidates: {candidates}")
+        if IN_DEBUG_MODE:
+            d(f"Unfiltered candidates: {candidates}")
 
         # Filter and sort them appropriately for our context (e.g. the lens, the
         # alignment mode and the current input postion.
@@ -117,14 +151,18 @@ class AbstractContainer(Rollbackable):
             candidates, lens, concrete_input_reader
         )
 
-        d(f"Filtered candidates: {candidates}")
+        if IN_DEBUG_MODE:
+            d(f"Filtered candidates: {candidates}")
 
+        # Bind the bound methods once, rather than looking them up per candidate.
+        put = lens.put
+        remove_item = self.remove_item
         for candidate in candidates:
             try:
                 # XXX : Overkill to copy initial state every time within automatic_rollback.
                 with automatic_rollback(concrete_input_reader):
-                    output = lens.put(candidate, concrete_input_reader, None)
-                    self.remove_item(lens, candidate)
+                    output = put(candidate, concrete_input_reader, None)
+                    remove_item(lens, candidate)
                     return output
             except LensException:
                 pass
@@ -140,48 +178,66 @@ class AbstractContainer(Rollbackable):
         of the lens, the container's alignment mode, and our position in the
         concrete_input_reader.  We can then sort them, to give preference for which
         will be tried firstmost in the consume_and_put_item() function.
+
+        Note, this returns an iterable of candidates, which need not be a list.
         """
 
         # Handle a static label lens, in which the candidate choice is
         # straightforward - here, for flexibility, we assume several items may share
         # a static label.
-        if has_value(lens.options.label):
-            d(f"Using static label: '{lens.options.label}'")
+        label = lens.options.label
+        alignment_mode = self._alignment_mode
+        if label is not None:
+            if IN_DEBUG_MODE:
+                d(f"Using static label: '{label}'")
             # XXX: Feels a bit of a hack to use attr_label, so will think more
             # generally about this.
             valid_candidates = [
                 item
                 for item in candidate_items
-                if lens.options.label
-                in [item._meta_data.label, item._meta_data.attr_label]
+                if label == item._meta_data.label or label == item._meta_data.attr_label
             ]
             return valid_candidates
 
         # Handle MODEL alignment (i.e. PUT will be in order of items in the abstract
         # model).
-        if self._alignment_mode == MODEL:
-            # By definition, items are already in that order.
-            if len(candidate_items) > 0:
-                return [candidate_items[0]]
-            else:
-                return []
+        if alignment_mode == MODEL:
+            # By definition, items are already in that order, so only the first
+            # may be PUT.  Note, ListContainer passes its own list here (not a
+            # copy), so this is cheap however many items it holds.
+            return candidate_items[:1]
 
         # Handle SOURCE alignment.
-        if self._alignment_mode == SOURCE:
-            # Copy candidate_items.
-            def get_key(item):
-                if has_value(item._meta_data.concrete_start_position):
-                    return item._meta_data.concrete_start_position
-                return LARGE_INTEGER  # To ensure new items go on the end.
-
-            # Sort the candiates by their source order - if they have meta on their
-            # source position.
-            sorted_candidate_items = sorted(candidate_items, key=get_key)
-            return sorted_candidate_items
+        if alignment_mode == SOURCE:
+            # Nothing to sort.
+            if len(candidate_items) < 2:
+                return candidate_items
+
+            # Yield the candidates by their source order - if they have meta on
+            # their source position.  Usually the first candidate is PUT, so rather
+            # than sorting them all we lazily pop them from a heap (the index
+            # breaks ties, keeping the order stable).  Keys are extracted once per
+            # item, rather than per comparison.
+            positions = self.get_source_positions(candidate_items)
+            heap = [
+                (position, index, item)
+                for index, (position, item) in enumerate(
+                    zip(positions, candidate_items)
+                )
+            ]
+            heapq.heapify(heap)
+            return (heapq.heappop(heap)[2] for _ in range(len(heap)))
         # TODO: LABEL alignment mode
 
         raise Exception(f"Unknown alignment mode: {self._alignment_mode}")
 
+    def get_source_positions(self, candidate_items):
+        """
+        Returns the source position of each candidate item, for SOURCE alignment.
+        Containers may overload this to avoid reading every item's meta data.
+        """
+        return [get_source_position(item) for item in candidate_items]
+
     #
     # Must overload these.
     #
@@ -221,43 +277,90 @@ class ListContainer(AbstractContainer):
     def __new__(cls, *args, **kargs):
         self = super().__new__(cls)
         self.container_item = []
+        # The source positions of our items, kept in step with container_item once
+        # built, which we leave until they are needed for SOURCE alignment, since
+        # GET never needs them.
+        self._positions = None
+        # A log of changes to our items, which allows cheap rollback: None for an
+        # appended item, or the (index, item) of a removed item.
+        self._journal = []
         return self
 
     def __init__(self, container_item):
         assert isinstance(container_item, list)
-        self.container_item = container_item
 
-        assert_msg(isinstance(self.container_item, list))
+        assert_msg(isinstance(container_item, list))
 
         # Ensure our items can carry meta data (for algorithmic convenience) and be careful
         # to preserve the incoming lists meta data by modifying it in place.
         # Perhaps this can be done in AbstractContainer
-        for index, item in enumerate(self.container_item):
-            self.container_item[index] = enable_meta_data(item)
+        for index, item in enumerate(container_item):
+            container_item[index] = enable_meta_data(item)
+
+        # PUT consumes our items, and rollback restores them in place, so we work
+        # on a copy, leaving the incoming list intact (e.g. to be PUT again).
+        self.container_item = list(container_item)
 
     def get_put_candidates(self, lens, concrete_input_reader):
         return self.container_item
 
+    def get_source_positions(self, candidate_items):
+        if candidate_items is self.container_item:
+            if self._positions is None:
+                self._positions = [
+                    get_source_position(item) for item in self.container_item
+                ]
+            return self._positions
+        return super().get_source_positions(candidate_items)
+
     def remove_item(self, lens, item):
         # d("Removing item %s" % item)
-        self.container_item.remove(item)
+        # Find the item by identity rather than with list.remove(), which would
+        # compare by value (expensive for LensObjects and possibly removing an
+        # equal but different item).  Candidates are usually taken from near the
+        # front of the list, so this search is short.
+        for index, candidate in enumerate(self.container_item):
+            if candidate is item:
+                del self.container_item[index]
+                if self._positions is not None:
+                    del self._positions[index]
+                self._journal.append((index, item))
+                return
+
+        raise Exception(f"Failed to remove item {item} from {self}.")
 
     def store_item(self, item, lens, concrete_input_reader):
         self.container_item.append(item)
+        if self._positions is not None:
+            self._positions.append(get_source_position(item))
+        self._journal.append(None)
 
     def unwrap(self):
+        # GET is complete, so there is nothing left that could be rolled back.
+        self._journal.clear()
         return self.container_item
 
     def _get_state(self, copy_state=True):
-        state = [
-            copy_state and copy.copy(self.container_item) or self.container_item,
-            self._label,
-        ]
-        return state
+        # Our state is the point in the journal to which we would roll back, so
+        # there is no need to copy our items.
+        return (len(self._journal), self._label)
 
     def _set_state(self, state, copy_state=True):
-        self.container_item = copy_state and copy.copy(state[0]) or state[0]
-        self._label = state[1]
+        # Undo journaled changes in reverse order.
+        journal_length, self._label = state
+        journal = self._journal
+        positions = self._positions
+        while len(journal) > journal_length:
+            entry = journal.pop()
+            if entry is None:
+                self.container_item.pop()
+                if positions is not None:
+                    positions.pop()
+            else:
+                index, item = entry
+                self.container_item.insert(index, item)
+                if positions is not None:
+                    positions.insert(index, get_source_position(item))
 
     def __str__(self):
         return str(self.container_item)
@@ -271,6 +374,12 @@ class ListContainer(AbstractContainer):
 class DictContainer(ListContainer):
     """Allows a list of items with labels to be accessed as a native python dict."""
 
+    def __new__(cls, *args, **kargs):
+        self = super().__new__(cls)
+        # Our items indexed by label, for static label lenses (built on first use).
+        self._items_by_label = None
+        return self
+
     def __init__(self, container_item):
         """
         We actually use all the functionality of the ListContainer, which we
@@ -282,25 +391,57 @@ class DictContainer(ListContainer):
         assert isinstance(container_item, dict)
         self.container_item = container_item
 
-        # Create a list to hold the items.
-        items_as_list = []
-
         # XXX: Perhaps this should got in prepare_for_put.
-        # Now add the items to the list, updating their labels from keys.
-        assert isinstance(container_item, dict)
-        for key, item in container_item.items():
-            item = enable_meta_data(item)
+        # Now build a list of the items, then update their labels from the keys
+        # (a dict iterates its keys in the same order as its values).
+        items_as_list = [enable_meta_data(item) for item in container_item.values()]
+        for item, key in zip(items_as_list, container_item):
             item._meta_data.label = key
-            items_as_list.append(item)
 
         super().__init__(items_as_list)
 
     # TODO: Choose default alignment mode in set_container_lens().
 
+    def get_put_candidates(self, lens, concrete_input_reader):
+        # A static label lens can only PUT items with that label, so look them up
+        # rather than have every item filtered for each PUT.
+        label = lens.options.label
+        if label is None:
+            return self.container_item
+        if self._items_by_label is None:
+            # Build the index on demand, since it is only needed for PUT.
+            items_by_label = self._items_by_label = defaultdict(deque)
+            for item in self.container_item:
+                items_by_label[item._meta_data.label].append(item)
+        # Note, filtering then gives a list, so the index is safe to modify.
+        return self._items_by_label.get(label, ())
+
+    def remove_item(self, lens, item):
+        super().remove_item(lens, item)
+        items_by_label = self._items_by_label
+        if items_by_label is not None:
+            # Remove by identity, as for our list.  The item is usually the first
+            # with its label, so this is cheap.
+            items = items_by_label[item._meta_data.label]
+            if items[0] is item:
+                items.popleft()
+            else:
+                for index, candidate in enumerate(items):
+                    if candidate is item:
+                        del items[index]
+                        break
+
     def store_item(self, item, *args, **kargs):
         if not has_value(item._meta_data.label):
             raise LensException(f"{self} expected item {item} to have a label.")
         super().store_item(item, *args, **kargs)
+        self._items_by_label = None
+
+    def _set_state(self, state, copy_state=True):
+        if len(self._journal) > state[0]:
+            # Restored items would be out of order in the index, so rebuild it.
+            self._items_by_label = None
+        super()._set_state(state, copy_state)
 
     def unwrap(self):
         # First unwrap to a list.
@@ -367,6 +508,16 @@ class LensObject(AbstractContainer):
         """
         self = super().__new__(cls, *args, **kargs)
 
+        # Maps id(item) -> attribute name, so items may be quickly found for
+        # removal.  Entries are validated on use, so may safely go stale.
+        self._item_to_attr = {}
+
+        # A log of (attribute name, previous value) for each change made to our
+        # items, which allows cheap rollback by undoing recent changes rather than
+        # by copying all of our state.  The entry of a removed attribute also
+        # holds the order of our attributes, so that undoing it keeps that order.
+        self._journal = []
+
         # If sub-containers have been specified on the class, instantiate them on the instance.
         self._create_containers_and_attributes()
 
@@ -383,13 +534,17 @@ class LensObject(AbstractContainer):
         # First see if the item is to be stored in one of our containers.
         sub_container = self._get_item_sub_container(lens, item)
         if sub_container:
-            d(f"Storing {item} in container {sub_container}")
+            if IN_DEBUG_MODE:
+                d(f"Storing {item} in container {sub_container}")
             return sub_container.store_item(item, lens, concrete_input_reader)
 
         if not has_value(item._meta_data.label):
             raise LensException(f"{self} expected item {item} to have a label.")
         # TODO: If constrained attributes, check within set.
-        setattr(self, self.map_label_to_identifier(item._meta_data.label), item)
+        identifier = self.map_label_to_identifier(item._meta_data.label)
+        self._journal.append((identifier, self.__dict__.get(identifier, _MISSING)))
+        setattr(self, identifier, item)
+        self._item_to_attr[id(item)] = identifier
 
     def unwrap(self):
         """We are both the container and the native object."""
@@ -398,6 +553,9 @@ class LensObject(AbstractContainer):
         for name, container in self._containers.items():
             setattr(self, name, container.unwrap())
 
+        # GET is complete, so there is nothing left that could be rolled back.
+        self._journal.clear()
+
         return self
 
     #
@@ -415,38 +573,44 @@ class LensObject(AbstractContainer):
         # First see if the item is to be put from one of our containers.
         sub_container = self._get_item_sub_container(lens)
         if sub_container:
-            d(f"Using sub container {sub_container}")
+            if IN_DEBUG_MODE:
+                d(f"Using sub container {sub_container}")
             return sub_container.get_put_candidates(lens, concrete_input_reader)
 
         # Now try to find our own candidates.
-        d(f"Looking for own canidates. {self.__dict__}")
-        candidates = []
-
-        # Append all of our data attributes that are not None.
-        for attr_name in self._get_attribute_names():
-            # Skip if the item has not been set.
-            if attr_name not in self.__dict__:
-                continue
-
-            item = self.__dict__[attr_name]
-            if has_value(item):
-                candidates.append(item)
-
-        return candidates
+        if IN_DEBUG_MODE:
+            d(f"Looking for own canidates. {self.__dict__}")
+        # All of our data attributes that have been set and are not None.
+        instance_dict = self.__dict__
+        return [
+            instance_dict[attr_name]
+            for attr_name in self._get_attribute_names()
+            if instance_dict.get(attr_name) is not None
+        ]
 
     def remove_item(self, lens, item):
         # First see if the item is to be put from one of our containers.
         sub_container = self._get_item_sub_container(lens, item)
         if sub_container:
-            d(f"Removing {item} from {sub_container}")
+            if IN_DEBUG_MODE:
+                d(f"Removing {item} from {sub_container}")
             sub_container.remove_item(lens, item)
             return
 
-        d(f"Preparing to remove {item}")
-        for attr_name, value in self.__dict__.items():
-            if value is item:
-                del self.__dict__[attr_name]
-                return
+        if IN_DEBUG_MODE:
+            d(f"Preparing to remove {item}")
+        # Note, we do not pop the entry, since rollback may reinstate the item.
+        instance_dict = self.__dict__
+        attr_name = self._item_to_attr.get(id(item))
+        if attr_name is None or instance_dict.get(attr_name) is not item:
+            # Otherwise, search for it (e.g. if the attribute was set directly).
+            attr_name = next(
+                (name for name, value in instance_dict.items() if value is item), None
+            )
+        if attr_name is not None:
+            self._journal.append((attr_name, item, tuple(instance_dict)))
+            del instance_dict[attr_name]
+            return
 
         raise Exception(f"Failed to remove item {item} from {self}.")
 
@@ -467,10 +631,9 @@ class LensObject(AbstractContainer):
 
     def is_fully_consumed(self):
         # Check if our items are consumed.
+        instance_dict = self.__dict__
         for attribute_name in self._get_attribute_names():
-            if attribute_name in self.__dict__ and has_value(
-                self.__dict__[attribute_name]
-            ):
+            if instance_dict.get(attribute_name) is not None:
                 return False
 
         # Then, check if at least one of our containers is not fully consumed.
@@ -489,14 +652,20 @@ class LensObject(AbstractContainer):
         Tries to convert a typical label to a python identifier.  You may wish to
         overload this if you require more specialised conversion.
         """
-        identifier = self._map_label_to_identifier(label)
-
-        # Check we end up with a valid python keyword.
-        if not re.match(r"[a-zA-Z][a-zA-Z0-9_]*$", identifier):
-            raise Exception(
-                "Cannot express label '%s' (converted to '%s') as a python identifer to set as an object attribute - you will have to specialise this functionality for your purposes."
-                % (label, identifier)
-            )
+        # Mappings are pure functions of the label, so reuse any previous
+        # conversion made for our class.
+        identifier_cache = self._get_class_cache("_label_to_identifier_cache")
+        identifier = identifier_cache.get(label)
+        if identifier is None:
+            identifier = self._map_label_to_identifier(label)
+
+            # Check we end up with a valid python keyword.
+            if not _IDENT_RE.match(identifier):
+                raise Exception(
+                    "Cannot express label '%s' (converted to '%s') as a python identifer to set as an object attribute - you will have to specialise this functionality for your purposes."
+                    % (label, identifier)
+                )
+            _store_in_class_cache(identifier_cache, label, identifier)
 
         # Cache this conversion on the class, since it may be useful to improve
         # CREATED labels.
@@ -508,16 +677,28 @@ class LensObject(AbstractContainer):
         if identifier in self.__class__.__cached_labels:
             return self.__class__.__cached_labels[identifier]
 
-        # We assume that an underscore represents a space.
-        return self._map_identifier_to_label(identifier)
+        label_cache = self._get_class_cache("_identifier_to_label_cache")
+        label = label_cache.get(identifier)
+        if label is None:
+            # We assume that an underscore represents a space.
+            label = self._map_identifier_to_label(identifier)
+            # Intern the label, since it will be compared with static lens labels.
+            if type(label) is str:
+                label = sys.intern(label)
+            _store_in_class_cache(label_cache, identifier, label)
+        return label
 
     # He he: Really we should use a lens for these mappings, but perhaps it's
     # easy enough to do it like this.
     def _map_label_to_identifier(self, label):
         """This might be overridded to specialise this functionality for a specific."""
+        # Common case: the label is already a lowercase identifier.
+        if label.isidentifier() and label.islower():
+            return label
         identifier = label.lower()
-        # XXX: We could pre-compile this regex.
-        identifier = re.sub(r"[ ]+", "_", identifier)
+        # Only invoke the regex engine if there are spaces to collapse.
+        if " " in identifier:
+            identifier = _SPACES_RE.sub("_", identifier)
         return identifier
 
     def _map_identifier_to_label(self, identifier):
@@ -528,6 +709,19 @@ class LensObject(AbstractContainer):
     # Other internal functions.
     #
 
+    def _get_class_cache(self, name):
+        """
+        Returns a dict, stored on our own class (i.e. not inherited from a base
+        class, which may map things differently), for caching class-invariant
+        results.
+        """
+        cls = self.__class__
+        cache = cls.__dict__.get(name)
+        if cache is None:
+            cache = {}
+            setattr(cls, name, cache)
+        return cache
+
     def _create_containers_and_attributes(self):
         """Create any sub-containers, if declared."""
         self._containers = {}
@@ -551,6 +745,36 @@ class LensObject(AbstractContainer):
             elif isinstance(value, Attribute):
                 self._constrained_attributes[key] = value
 
+        # The following is the same for every instance, so work it out only once
+        # for our class.
+        cls = self.__class__
+        if "_declared_attribute_names" in cls.__dict__:
+            return
+
+        # Sort the attributes by declaration order - captured by a static counter
+        # in Attribute.
+        constrained_attributes = self._constrained_attributes
+        cls._declared_attribute_names = tuple(
+            sorted(
+                constrained_attributes,
+                key=lambda name: constrained_attributes[name]._counter,
+            )
+        )
+
+        # Map the lenses and types whose items our containers store to the
+        # declaration index of the first container to store them, since where
+        # containers match an item by different criteria, the first declared
+        # takes precedence.
+        cls._container_names = tuple(self._containers)
+        cls._lens_to_container = {}
+        cls._type_to_container = {}
+        for index, name in enumerate(cls._container_names):
+            container_properties = cls.__dict__[name]
+            for lens in container_properties.store_items_from_lenses or []:
+                cls._lens_to_container.setdefault(lens, index)
+            for item_type in container_properties.store_items_of_type or []:
+                cls._type_to_container.setdefault(item_type, index)
+
     def _get_item_sub_container(self, lens, item=None):
         # Note, for lens matching in the get direction we use item meta (since may
         # be returned from higer lens with no type, such as Or)
@@ -560,33 +784,23 @@ class LensObject(AbstractContainer):
         #  d(item)
         #  assert(item._meta_data.lens)
 
-        for name, container in self._containers.items():
-            container_properties = self.__class__.__dict__[name]
-            d(f"looking for item to match lens {lens}")
-            if (
-                has_value(container_properties.store_items_from_lenses)
-                and lens in container_properties.store_items_from_lenses
-            ):
-                return container
-            elif (
-                has_value(item)
-                and has_value(container_properties.store_items_from_lenses)
-                and has_value(item._meta_data.lens)
-                and item._meta_data.lens in container_properties.store_items_from_lenses
-            ):
-                return container
-            elif (
-                has_value(container_properties.store_items_of_type)
-                and type(item) in container_properties.store_items_of_type
-            ):
-                return container
-            elif (
-                lens.has_type()
-                and lens.type in container_properties.store_items_of_type
-            ):
-                return container
+        if not self._containers:
+            return None
 
-        return None
+        if IN_DEBUG_MODE:
+            d(f"looking for item to match lens {lens}")
+        lens_to_container = self._lens_to_container
+        type_to_container = self._type_to_container
+        indices = [lens_to_container.get(lens), type_to_container.get(type(item))]
+        if has_value(item) and has_value(item._meta_data.lens):
+            indices.append(lens_to_container.get(item._meta_data.lens))
+        if lens.has_type():
+            indices.append(type_to_container.get(lens.type))
+
+        indices = [index for index in indices if index is not None]
+        if not indices:
+            return None
+        return self._containers[self._container_names[min(indices)]]
 
     def _set_excluded_attributes(self):
         """
@@ -600,8 +814,8 @@ class LensObject(AbstractContainer):
         Note that any attribute that starts with an underscore will be excluded, so
         this aims to exclude any other attributes, such as sub-container attributes.
         """
-        self._excluded_attributes = list(self.__dict__.keys()) + list(
-            self._containers.keys()
+        self._excluded_attributes = frozenset(self.__dict__) | frozenset(
+            self._containers
         )
 
     def _get_attribute_names(self):
@@ -609,63 +823,92 @@ class LensObject(AbstractContainer):
 
         # If the useable attributes have been declared, use their names here, in declaration order.
         if self._constrained_attributes:
-            # Sort the items according to their declaration order - captured by a static counter in Attribute
-            items = sorted(
-                self._constrained_attributes.items(), key=lambda x: x[1]._counter
-            )
-            attributes = [item[0] for item in items]
-            return attributes
+            return self._declared_attribute_names
 
         # Otherwise, use every object attribute that is not excluded.
-        attributes = []
-        for attr_name in self.__dict__.keys():
-            if attr_name not in self._excluded_attributes and not attr_name.startswith(
-                "_"
-            ):
-                attributes.append(attr_name)
+        excluded_attributes = self._excluded_attributes
+        attributes = [
+            attr_name
+            for attr_name in self.__dict__
+            if attr_name not in excluded_attributes and not attr_name.startswith("_")
+        ]
 
         return attributes
 
     def _enable_attributes_meta(self):
         """Enables meta on attributes that may be used as container state."""
+        instance_dict = self.__dict__
+        item_to_attr = self._item_to_attr
         for attr_name in self._get_attribute_names():
-            if attr_name not in self.__dict__:
+            value = instance_dict.get(attr_name, _MISSING)
+            if value is _MISSING:
                 continue
 
-            item = enable_meta_data(self.__dict__[attr_name])
-            self.__dict__[attr_name] = item
+            item = enable_meta_data(value)
+            if item is not value:
+                self._journal.append((attr_name, value))
+                instance_dict[attr_name] = item
+            item_to_attr[id(item)] = attr_name
             # Ensure the label of the item is updated to match the current attribute
             # name.  If our label has changed, we need to regenerate a label.
-            current_label = item._meta_data.label
-            if not (
-                has_value(current_label)
-                and self.map_label_to_identifier(current_label) == attr_name
+            meta_data = item._meta_data
+            current_label = meta_data.label
+            if (
+                current_label is None
+                or self.map_label_to_identifier(current_label) != attr_name
             ):
-                item._meta_data.label = self.map_identifier_to_label(attr_name)
+                meta_data.label = self.map_identifier_to_label(attr_name)
                 # XXX: Feels like a hack for now, to get around issue of static labels
                 # being changed incorrectly in the same way as a dynamic label
-                item._meta_data.attr_label = attr_name
+                meta_data.attr_label = attr_name
 
     def _get_state(self, copy_state=True):
-        # Get our state.
-        state = [copy_state and copy.copy(self.__dict__) or self.__dict__]
-
-        # Then append state of our containers.
-        for sub_container in self._containers.values():
-            state.append(sub_container._get_state(copy_state=copy_state))
+        # Get our state, which is simply the point in the journal to which we would
+        # roll back, so there is no need to copy anything.
+        state = (len(self._journal), self._label)
+
+        # Then append state of our containers - most objects have none.
+        if self._containers:
+            state += tuple(
+                [
+                    sub_container._get_state(copy_state=copy_state)
+                    for sub_container in self._containers.values()
+                ]
+            )
 
         return state
 
     def _set_state(self, state, copy_state=True):
-        # XXX: Is there any conflict here with broad use of __dict__?
-        # Set our state.
-        self.__dict__ = copy_state and copy.copy(state[0]) or state[0]
+        # Set our state, undoing journaled changes in reverse order.
+        journal_length, self._label = state[0], state[1]
+        journal = self._journal
+        instance_dict = self.__dict__
+        while len(journal) > journal_length:
+            entry = journal.pop()
+            attr_name, value = entry[0], entry[1]
+            if value is _MISSING:
+                del instance_dict[attr_name]
+            elif len(entry) == 2 or attr_name in instance_dict:
+                instance_dict[attr_name] = value
+            else:
+                # Reinstate a removed attribute in its original place, since the
+                # order of our attributes is the order in which new items are PUT.
+                attribute_order = entry[2]
+                instance_dict[attr_name] = value
+                if attribute_order[-1] != attr_name:
+                    ordered = {
+                        name: instance_dict[name]
+                        for name in attribute_order
+                        if name in instance_dict
+                    }
+                    ordered.update(instance_dict)
+                    instance_dict.clear()
+                    instance_dict.update(ordered)
 
         # Then set the state of our containers.
-        i = 1
-        for sub_container in self._containers.values():
-            sub_container._set_state(state[i], copy_state=copy_state)
-            i += 1
+        if self._containers:
+            for sub_container, sub_state in zip(self._containers.values(), state[2:]):
+                sub_container._set_state(sub_state, copy_state=copy_state)
 
 
 class ContainerFactory:
@@ -702,7 +945,14 @@ class ContainerFactory:
         """
         # See if the lens type has a container class.
         container_class = ContainerFactory.get_container_class(container_type)
+        return ContainerFactory.create_container_of_class(container_class)
 
+    @staticmethod
+    def create_container_of_class(container_class):
+        """
+        Creates a container of a class found by get_container_class(), or returns
+        None if there is no such class.
+        """
         if container_class is None:
             return None
 
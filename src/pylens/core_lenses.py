@@ -3,19 +3,24 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import re
 import sys
+import threading
 
 from . import Lens
-from .debug import assert_msg, d
+from .base_lenses import FAILED
+from .debug import IN_DEBUG_MODE, assert_msg, d
 from .exceptions import (
     EndOfStringException,
     InfiniteRecursionException,
     LensException,
     NoDefaultException,
 )
-from .rollback import get_rollbackables_state, set_rollbackables_state
 from .util import has_value
 
+# The Forward lens PUTs in progress in each thread.
+_forward_put_state = threading.local()
+
 
 class Forward(Lens):
     """
@@ -29,32 +34,93 @@ class Forward(Lens):
         super().__init__(**options)
         d("Creating")
         self.recursion_limit = recursion_limit
+        # The (output, exception) of CREATing with no item or container.
+        self._created_output = None
 
     def bind_lens(self, lens):
         d(f"Binding to lens {lens}")
         assert_msg(len(self.lenses) == 0, "The lens cannot be re-bound.")
         self.set_sublens(lens)
+        self._created_output = None
 
     def _get(self, *args, **kargs):
         assert_msg(len(self.lenses) == 1, "A lens has yet to be bound.")
         return self.lenses[0]._get(*args, **kargs)
 
-    def _put(self, *args, **kargs):
+    def _put(self, item, concrete_input_reader, current_container):
         assert_msg(len(self.lenses) == 1, "A lens has yet to be bound.")
 
-        # Ensure the recursion limit is set before we start this.
-        original_limit = sys.getrecursionlimit()
-        if self.recursion_limit:
-            sys.setrecursionlimit(self.recursion_limit)
+        # CREATing with no item, input or container has no side effects, so the
+        # outcome depends only on the bound lens, and we keep it rather than
+        # descending through the recursion each time (e.g. as Or tries its lenses).
+        if item is None and concrete_input_reader is None and current_container is None:
+            if self._created_output is None:
+                # Whilst CREATing, recursing back here could never end, so it fails
+                # instead, allowing an outer Or to try its other lenses.
+                self._created_output = (
+                    None,
+                    NoDefaultException(f"Cannot CREATE {self} from within itself."),
+                )
+                try:
+                    output = self._put_proper(None, None, None)
+                except LensException as e:
+                    self._created_output = (None, e)
+                    raise
+                except Exception:
+                    self._created_output = None
+                    raise
+                self._created_output = (output, None)
+                return output
+
+            output, exception = self._created_output
+            if exception is not None:
+                raise exception.with_traceback(None)
+            return output
+
+        return self._put_proper(item, concrete_input_reader, current_container)
+
+    def _put_proper(self, item, concrete_input_reader, current_container):
+        # Identify this PUT by the state it starts from.  Since PUT is
+        # deterministic, if we are asked to make the same PUT again whilst it is
+        # still in progress, the recursion would never end.
+        frame = (
+            id(self),
+            id(item),
+            concrete_input_reader is not None
+            and (id(concrete_input_reader.string), concrete_input_reader.position),
+            current_container is not None
+            and (id(current_container), current_container._get_state()),
+        )
+        active_frames = getattr(_forward_put_state, "active_frames", None)
+        if active_frames is None:
+            active_frames = _forward_put_state.active_frames = set()
+        if frame in active_frames:
+            raise InfiniteRecursionException(
+                "You will need to alter your grammar, perhaps changing the order of Or lens operands"
+            )
+
+        # As a backstop, ensure the recursion limit is set before we start this.
+        # Note, this is only done by the outermost Forward PUT, rather than at
+        # every level of the recursion.
+        outermost = not active_frames
+        if outermost:
+            original_limit = sys.getrecursionlimit()
+            if self.recursion_limit:
+                sys.setrecursionlimit(self.recursion_limit)
 
+        active_frames.add(frame)
         try:
-            output = self.lenses[0]._put(*args, **kargs)
-        except RuntimeError:
+            output = self.lenses[0]._put(item, concrete_input_reader, current_container)
+        except RecursionError:
+            if not outermost:
+                raise
             raise InfiniteRecursionException(
                 "You will need to alter your grammar, perhaps changing the order of Or lens operands"
             )
         finally:
-            sys.setrecursionlimit(original_limit)
+            active_frames.discard(frame)
+            if outermost:
+                sys.setrecursionlimit(original_limit)
 
         return output
 
@@ -80,6 +146,7 @@ class Until(Lens):
         super().__init__(**options)
         self.set_sublens(lens)
         self.include_lens = include_lens
+        self._stop_pattern = None
 
     def _get(self, concrete_input_reader, current_container, force_return=False):
         # Note, we add force_return here so that put can utilise output regardless of
@@ -87,37 +154,40 @@ class Until(Lens):
         # function which both get and put use.
 
         # Remember the input position before we start to consume chars.
-        initial_position = concrete_input_reader.get_pos()
+        initial_position = concrete_input_reader.position
 
+        # Look these up once, rather than per char.
+        string = concrete_input_reader.string
         stopping_lens = self.lenses[0]
+        stop_pattern = self._get_stop_pattern()
 
         while True:
-            start_state = get_rollbackables_state(concrete_input_reader)
-            try:
-                stopping_lens.get(concrete_input_reader)
-
+            # Skip straight to the next position where the stopping lens could match,
+            # rather than trying it at every char.
+            if stop_pattern is not None:
+                match = stop_pattern.search(string, concrete_input_reader.position)
+                concrete_input_reader.position = match.start() if match else len(string)
+
+            # Note, the state of the reader is just its position, so we need only
+            # remember that to roll it back.
+            start_position = concrete_input_reader.position
+            if stopping_lens._try_get(concrete_input_reader) is not FAILED:
                 # If we are not to include consumption of the lenes, roll back the state
                 # after successfully getting the lens, since we do not want to include
                 # consumption of the lens.
                 if not self.include_lens:
-                    d(
-                        "Rollbacked from %s"
-                        % get_rollbackables_state(concrete_input_reader)
-                    )
-                    set_rollbackables_state(start_state, concrete_input_reader)
-                    d(
-                        "Rollbacked to %s"
-                        % get_rollbackables_state(concrete_input_reader)
-                    )
-                else:
-                    pass
+                    if IN_DEBUG_MODE:
+                        d(f"Rollbacked from {concrete_input_reader.get_pos()}")
+                    concrete_input_reader.position = start_position
+                    if IN_DEBUG_MODE:
+                        d(f"Rollbacked to {start_position}")
 
                 break
 
-            except LensException:
-                # We have not reached the stopping lens in input yet, so we rollback and then carry on.
+            # We have not reached the stopping lens in input yet, so we rollback and then carry on.
+            if IN_DEBUG_MODE:
                 d("stopping_lens failed soi continuing.")
-                set_rollbackables_state(start_state, concrete_input_reader)
+            concrete_input_reader.position = start_position
 
             # Advance the input reader by one char - this will form part of our lens' GOTen string.
             try:
@@ -131,12 +201,43 @@ class Until(Lens):
         if not parsed_chars:
             raise LensException("Expected to get at least one character!")
 
-        if self.has_type() or force_return:
+        if self.type is not None or force_return:
             return parsed_chars
 
         # Return nothing if we are not a STORE lens.
         return None
 
+    def _get_stop_pattern(self):
+        """
+        Returns a regex that finds where the stopping lens may match, or None if
+        the lens must be tried at every position.
+        """
+        # Note, this is worked out on first use, and then kept (as False if there
+        # is no pattern).
+        if self._stop_pattern is None:
+            self._stop_pattern = False
+
+            # Searching for the chars with which the stopping lens may begin is
+            # fastest, since the regex engine can skip other chars without trying
+            # a match at each.
+            first_chars = self.lenses[0]._get_first_chars()
+            if first_chars is not None:
+                # An empty class never matches, so we skip to the end of input.
+                chars = "".join(re.escape(char) for char in sorted(first_chars))
+                self._stop_pattern = re.compile(f"[{chars}]" if chars else "(?!)")
+
+            # Otherwise, if the stopping lens has a regex (e.g. it begins with
+            # optional whitespace), we can still find just where it matches.  Note,
+            # that regex may need atomic groups, which Python supports from 3.11.
+            else:
+                lens_pattern = self.lenses[0]._get_tree_pattern({})
+                if lens_pattern is not None:
+                    try:
+                        self._stop_pattern = re.compile(f"(?={lens_pattern})")
+                    except re.error:
+                        pass
+        return self._stop_pattern or None
+
     def _put(self, item, concrete_input_reader, current_container):
         if self.has_type():
             if not isinstance(item, str) and len(item) > 0:
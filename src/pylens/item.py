@@ -11,8 +11,12 @@ META_ATTRIBUTE = "_meta_data"
 #
 # Wrappers for simple types, so we can transparently add arbitrary properies.
 #
+# Note, where python allows, a wrapper holds its meta data in a slot, so that no
+# instance __dict__ need be allocated for it (int, whose instances vary in size,
+# does not allow this).
+#
 class str_wrapper(str):
-    pass
+    __slots__ = (META_ATTRIBUTE,)
 
 
 class int_wrapper(int):
@@ -20,15 +24,43 @@ class int_wrapper(int):
 
 
 class float_wrapper(float):
-    pass
+    __slots__ = (META_ATTRIBUTE,)
 
 
 class list_wrapper(list):
-    pass
+    __slots__ = (META_ATTRIBUTE,)
 
 
 class dict_wrapper(dict):
-    pass
+    __slots__ = (META_ATTRIBUTE,)
+
+
+class MetaData(Properties):
+    """
+    The meta data of an item.  Properties read by the framework default to None
+    on the class, since reading an unset property would otherwise fall back on
+    __getattr__ (after an internal AttributeError), which is slow.
+    """
+
+    label = None
+    attr_label = None
+    is_label = None
+    lens = None
+    concrete_start_position = None
+    concrete_end_position = None
+    concrete_input_reader = None
+    singleton_meta_data = None
+
+
+# Wrappers for exact builtin types, to avoid an isinstance() chain for the common
+# case.
+_WRAPPERS = {
+    str: str_wrapper,
+    float: float_wrapper,
+    int: int_wrapper,
+    list: list_wrapper,
+    dict: dict_wrapper,
+}
 
 
 def item_has_meta(item):
@@ -46,8 +78,15 @@ def enable_meta_data(item):
     """
     assert has_value(item)
 
-    if not item_has_meta(item):
-        # Wrap simple types to allow attributes to be added to them.
+    # Exact builtin types cannot carry meta data, so we need not look for it
+    # (which, failing, would raise and catch an AttributeError).
+    wrapper = _WRAPPERS.get(type(item))
+    if wrapper is not None:
+        item = wrapper(item)
+        item._meta_data = MetaData()
+
+    elif not item_has_meta(item):
+        # Wrap other simple types to allow attributes to be added to them.
         if isinstance(item, str):
             item = str_wrapper(item)
         elif isinstance(item, float):
@@ -59,6 +98,6 @@ def enable_meta_data(item):
         elif isinstance(item, dict):
             item = dict_wrapper(item)
 
-        setattr(item, META_ATTRIBUTE, Properties())
+        setattr(item, META_ATTRIBUTE, MetaData())
 
     return item
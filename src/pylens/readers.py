@@ -9,21 +9,29 @@ from .exceptions import EndOfStringException
 from .rollback import Rollbackable
 from .util import truncate
 
+# The number of remaining chars a reader displays.
+DISPLAY_LENGTH = 10
+
 
 class ConcreteInputReader(Rollbackable):
     """Stateful reader of the concrete input string."""
 
     position: int
     string: str
+    # Memoised outcomes of cached lenses, keyed by (lens, position), which are
+    # shared by readers of the same string.
+    parse_cache: dict
 
     def __init__(self, input: str | ConcreteInputReader):
         match input:
             case ConcreteInputReader():
                 self.position = input.position
                 self.string = input.string
+                self.parse_cache = input.parse_cache
             case str():
                 self.position = 0
                 self.string = input
+                self.parse_cache = {}
 
     def reset(self):
         self.set_pos(0)
@@ -63,12 +71,33 @@ class ConcreteInputReader(Rollbackable):
         """
         Consume and return the next char from input.
         """
-        if self.is_fully_consumed():
+        # Note, is_fully_consumed() is inlined, since this is called per char.
+        position = self.position
+        if position >= len(self.string):
             raise EndOfStringException()
 
-        char = self.string[self.position]
-        self.position += 1
-        return char
+        self.position = position + 1
+        return self.string[position]
+
+    def consume_if_next(self, string):
+        """
+        Consume the given string if it comes next in the input, returning whether
+        it did.  Unlike consume_string(), this need not slice the input.
+        """
+        if self.string.startswith(string, self.position):
+            self.position += len(string)
+            return True
+        return False
+
+    def consume_match(self, pattern):
+        """
+        Consume the input matched by the compiled regex pattern at the current
+        position, returning the match, or None if there was no match.
+        """
+        match = pattern.match(self.string, self.position)
+        if match:
+            self.position = match.end()
+        return match
 
     def is_fully_consumed(self):
         """
@@ -85,7 +114,9 @@ class ConcreteInputReader(Rollbackable):
         if self.is_fully_consumed():
             return "END_OF_STRING"
 
-        display_string = self.string[self.position :]
-        return "'" + truncate(display_string) + "'"
+        # Slice only as much of the input as we would display (plus a char, so
+        # that it is still shown to be truncated).
+        display_string = self.string[self.position : self.position + DISPLAY_LENGTH + 1]
+        return "'" + truncate(display_string, DISPLAY_LENGTH) + "'"
 
     __repr__ = __str__
@@ -5,7 +5,7 @@
 
 import copy
 
-from pylens.debug import d
+from pylens.debug import IN_DEBUG_MODE, d
 from pylens.exceptions import RollbackException
 
 
@@ -67,10 +67,11 @@ def get_rollbackables_state(*rollbackables, copy_state=True, **kargs):
     """
 
     # Note: rollbackables must be in same order for get and set.
-    rollbackables_state = []
-    for rollbackable in rollbackables:
-        if isinstance(rollbackable, Rollbackable):
-            rollbackables_state.append(rollbackable._get_state(copy_state=copy_state))
+    rollbackables_state = [
+        rollbackable._get_state(copy_state=copy_state)
+        for rollbackable in rollbackables
+        if isinstance(rollbackable, Rollbackable)
+    ]
 
     # if IN_DEBUG_MODE :
     #  d("Getting state : %s" % rollbackables_state)
@@ -130,7 +131,8 @@ class automatic_rollback:
         # If a RollbackException is thrown, revert all the rollbackables.
         if type and issubclass(type, RollbackException):
             set_rollbackables_state(self.start_state, *self.rollbackables)
-            d(f"Rolled back rollbackables to: {str(self.rollbackables)}.")
+            if IN_DEBUG_MODE:
+                d(f"Rolled back rollbackables to: {str(self.rollbackables)}.")
 
         # XXX: Optimise this to first check for concrete reader.
         if self.check_for_state_change:
@@ -17,3 +17,11 @@ class GlobalSettings:
     You might wish to set this to False when developing or debugging your own lenses.
     """
     check_consumption = True
+
+    """
+    Memoise the GET of every lens at each input position (i.e. packrat parsing),
+    as if each lens had been given the option cache=True, unless it was given
+    cache=False.  This bounds the work of heavily backtracking grammars, though
+    costs time and memory for those that rarely backtrack.
+    """
+    memoize_parse = False
@@ -2,10 +2,22 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-from pytest import raises
-
-from pylens.base_lenses import And, AnyOf, Empty, Group, Literal, Repeat
+import sys
+
+from pytest import mark, raises
+
+from pylens.base_lenses import (
+    FAILED,
+    And,
+    AnyOf,
+    Empty,
+    Group,
+    Lens,
+    Literal,
+    Repeat,
+)
 from pylens.charsets import alphas, nums
+from pylens.containers import DictContainer, LensObject
 from pylens.debug import assert_equal, auto_name_lenses, d, describe_test
 from pylens.exceptions import (
     LensException,
@@ -50,6 +62,13 @@ def test_and():
     output = lens.put([["b", 9], ["c", 4]])
     assert output == "b*9c*4"
 
+    d("Setting a sub-lens type after construction")
+    literal = Literal("a")
+    lens = literal + Literal("b")
+    assert lens.get("ab") is None
+    literal.type = str
+    assert Group(lens, type=list).get("ab") == ["a"]
+
 
 def test_or():
     d("GET")
@@ -107,6 +126,25 @@ def test_or():
     assert lens.put(got, concrete_input_reader) == "4"
     assert concrete_input_reader.is_fully_consumed()
 
+    d("Test that only lenses that may match the next char are tried.")
+    a, b, empty = Literal("ab"), AnyOf("abc"), Empty()
+    lens = a | b | empty
+    assert lens._get_lenses_to_try(ConcreteInputReader("a")) == [a, b, empty]
+    assert lens._get_lenses_to_try(ConcreteInputReader("b")) == [b, empty]
+    assert lens._get_lenses_to_try(ConcreteInputReader("x")) == [empty]
+    assert lens._get_lenses_to_try(ConcreteInputReader("")) == [a, b, empty]
+
+    d("Test that only the first literal to match is tried.")
+    long, short = Literal("ab-c", is_label=True), Literal("ab", type=str)
+    lens = long | short | Literal("abc")
+    assert lens._get_lenses_to_try(ConcreteInputReader("ab-c")) == (long,)
+    assert lens._get_lenses_to_try(ConcreteInputReader("abc")) == (short,)
+    assert lens._get_lenses_to_try(ConcreteInputReader("x")) == ()
+    assert lens.get("ab-c") == "ab-c"
+
+    lens = long | empty
+    assert lens._get_lenses_to_try(ConcreteInputReader("ab")) == (empty,)
+
 
 def test_any_of():
     lens = AnyOf(alphas, type=str, some_property="some_val")
@@ -145,6 +183,10 @@ def test_any_of():
     lens = AnyOf(nums, default=5)
     assert lens.put() == "5"
 
+    # Lenses of the same chars share their set of chars.
+    assert AnyOf(nums)._valid_char_set is lens._valid_char_set
+    assert AnyOf(list(nums)).get("4") is None
+
 
 def test_repeat():
     # Note, for some of these tests we need to ensure we PUT rather than CREATE
@@ -231,6 +273,16 @@ def test_repeat():
 
     GlobalSettings.check_consumption = True
 
+    d("Test runs of non-store chars, which are consumed in one go")
+    input_reader = ConcreteInputReader("12345abc")
+    assert Repeat(AnyOf(nums), max_count=3).get(input_reader) is None
+    assert input_reader.get_remaining() == "45abc"
+    assert Repeat(AnyOf(nums, negate=True), min_count=0).get(input_reader) is None
+    assert input_reader.get_remaining() == "45abc"
+    assert Repeat(AnyOf(nums, negate=True), min_count=0).get("abc") is None
+    with raises(TooFewIterationsException):
+        Repeat(AnyOf("4"), min_count=2).get(input_reader)
+
     d("Test infinity problem")
     lens = Repeat(Empty(), min_count=3, max_count=None)
     # Will fail to get anything since Empty lens changes no state.
@@ -300,11 +352,35 @@ def test_group():
     d("CREATE")
     assert lens.put(["x", 4]) == "x4"
 
+    # The container follows the lens type, even if it is reassigned.
+    lens.type = dict
+    assert isinstance(lens._create_lens_container(), DictContainer)
+    lens.type = list
+
     d("TEST erroneous Group with no type")
     with raises(AssertionError):
         lens = Group(AnyOf(nums))
 
 
+def test_coerce_lens_object():
+    class Digit(LensObject):
+        __lens__ = "#" + AnyOf(nums, type=int, label="value")
+
+    class Letter(Digit):
+        __lens__ = "#" + AnyOf(alphas, type=str, label="value")
+
+    # A LensObject class is coerced to the same lens each time, unless its
+    # __lens__ is reassigned.
+    lens = Lens._coerce_to_lens(Digit)
+    assert lens.type is Digit
+    assert Lens._coerce_to_lens(Digit) is lens
+    assert Lens._coerce_to_lens(Letter).type is Letter
+    assert Lens._coerce_to_lens(Letter).get("#a").value == "a"
+
+    Digit.__lens__ = "0"
+    assert Lens._coerce_to_lens(Digit) is not lens
+
+
 def test_litteral():
     d("GET")
     lens = Literal("xyz")
@@ -332,3 +408,131 @@ def test_litteral():
         lens.put("xyz", concrete_reader) == "xyz"
         and concrete_reader.get_remaining() == "abc"
     )
+
+
+def test_cache():
+    class CountingLiteral(Literal):
+        calls = 0
+
+        def _get(self, *args, **kargs):
+            CountingLiteral.calls += 1
+            return super()._get(*args, **kargs)
+
+    lens = CountingLiteral("xyz", cache=True)
+    concrete_reader = ConcreteInputReader("xyzabc")
+    assert lens.get(concrete_reader) is None
+    concrete_reader.set_pos(0)
+    assert lens.get(concrete_reader) is None
+    assert concrete_reader.get_remaining() == "abc"
+    assert CountingLiteral.calls == 1
+
+    # Failures are memoised too.
+    for _ in range(2):
+        concrete_reader.set_pos(3)
+        with raises(LensException):
+            lens.get(concrete_reader)
+    assert CountingLiteral.calls == 2
+
+    # STORE lenses return a fresh item each time.
+    lens = CountingLiteral("xyz", type=str, cache=True)
+    concrete_reader = ConcreteInputReader("xyzabc")
+    first = lens.get(concrete_reader)
+    concrete_reader.set_pos(0)
+    second = lens.get(concrete_reader)
+    assert first == second == "xyz" and first is not second
+    assert CountingLiteral.calls == 3
+
+    # Lenses may be memoised globally, unless they opt out.
+    GlobalSettings.memoize_parse = True
+    try:
+        for cache, expected_calls in ((None, 4), (False, 6)):
+            lens = CountingLiteral("xyz", cache=cache)
+            concrete_reader = ConcreteInputReader("xyzabc")
+            for _ in range(2):
+                concrete_reader.set_pos(0)
+                lens.get(concrete_reader)
+            assert CountingLiteral.calls == expected_calls
+    finally:
+        GlobalSettings.memoize_parse = False
+
+
+def test_try_get():
+    lenses = [
+        Literal("ab"),
+        Literal("ab", type=str),
+        AnyOf("a"),
+        AnyOf("a", negate=True),
+        AnyOf("a", type=str),
+        Empty(),
+        Empty(mode=Empty.START_OF_TEXT),
+        Empty(mode=Empty.END_OF_TEXT),
+        Literal("a") | Literal("b"),
+        Literal("a") + Literal("b"),
+        (Literal("a") + Literal("c")) | Literal("b") | Literal("ab"),
+        Literal("a") | AnyOf("b", type=str),
+    ]
+    # _try_get() must agree with get(), without raising.
+    for lens in lenses:
+        for string, position in (("ab", 0), ("ab", 1), ("ab", 2), ("b", 0)):
+            reader = ConcreteInputReader(string)
+            reader.set_pos(position)
+            try:
+                expected = lens.get(reader)
+            except LensException:
+                expected = FAILED
+            expected_position = reader.get_pos()
+
+            reader.set_pos(position)
+            got = lens._try_get(reader)
+            assert got == expected
+            if got is not FAILED:
+                assert reader.get_pos() == expected_position
+
+    # A sub-lens whose item cannot be stored fails.
+    container = DictContainer({})
+    lens = Literal("a") + AnyOf("b", type=str)
+    assert lens._try_get(ConcreteInputReader("ab"), container) is FAILED
+    assert (Literal("x") | lens)._try_get(ConcreteInputReader("ab"), container) is FAILED
+
+
+@mark.skipif(sys.version_info < (3, 11), reason="freeze() needs Python 3.11")
+def test_freeze():
+    GlobalSettings.check_consumption = True
+    word = Repeat(AnyOf(alphas), min_count=1)
+    spaces = Repeat(AnyOf(" "), min_count=0)
+    lens = Group(
+        Repeat(
+            And(AnyOf(nums, type=str), spaces, word | ("(" + word + ")"), spaces),
+            max_count=3,
+        ),
+        type=list,
+    )
+    assert lens.freeze() is lens
+
+    # Only the parts of the lens that store no items are compiled.
+    assert "_frozen_pattern" not in lens.__dict__
+    assert "_frozen_pattern" not in lens.lenses[0].__dict__
+    assert "_frozen_pattern" in lens.lenses[0].lenses[0].lenses[2].__dict__
+
+    assert lens.get("1 abc 2(de)  3 f") == ["1", "2", "3"]
+    with raises(LensException):
+        lens.get("1 (abc")
+    with raises(LensException):
+        lens.get("1 a2 b3 c4 d")
+
+    # A lens that stores items GETs each run of its non-store sub-lenses at once.
+    lens = Group(
+        AnyOf(alphas, type=str) + " " + Repeat(AnyOf("=")) + " " + AnyOf(nums, type=str),
+        type=list,
+    ).freeze()
+    assert len(lens.lenses[0]._frozen_steps) == 3
+    got = lens.get("a == 1")
+    assert got == ["a", "1"]
+    got[1] = "2"
+    assert lens.put(got) == "a == 2"
+
+    # The first alternative to match is chosen, as if not frozen.
+    lens = And(Literal("a") | Literal("ab"), "c").freeze()
+    with raises(LensException):
+        lens.get("abc")
+    lens.get("ac")
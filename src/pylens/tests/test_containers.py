@@ -0,0 +1,213 @@
+# Copyright (c) 2023-2024, Abilian SAS
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pylens import get, put
+from pylens.base_lenses import AnyOf, Group, Literal, Repeat
+from pylens.charsets import alphas, nums
+from pylens.containers import (
+    _CLASS_CACHE_MAX_SIZE,
+    LARGE_INTEGER,
+    SOURCE,
+    Attribute,
+    Container,
+    DictContainer,
+    LensObject,
+    ListContainer,
+)
+from pylens.item import enable_meta_data
+from pylens.util_lenses import KeyValue, List, Optional, Word
+
+
+def test_label_mapping():
+    class Person(LensObject):
+        pass
+
+    class Interface(LensObject):
+        def _map_label_to_identifier(self, label):
+            return label.replace("-", "_")
+
+        def _map_identifier_to_label(self, identifier):
+            return identifier.replace("_", "-")
+
+    person = Person()
+    assert person.map_label_to_identifier("Last   Name") == "last_name"
+    assert person.map_label_to_identifier("name") == "name"
+    # The original label is remembered, to improve CREATED labels.
+    assert person.map_identifier_to_label("last_name") == "Last   Name"
+    assert person.map_identifier_to_label("first_name") == "first name"
+
+    # Conversions are cached per class, so specialised mappings do not clash.
+    interface = Interface()
+    assert interface.map_label_to_identifier("dns-servers") == "dns_servers"
+    assert interface.map_identifier_to_label("some_thing") == "some-thing"
+    assert person.map_identifier_to_label("some_thing") == "some thing"
+
+
+def test_list_container_remove_item():
+    container = ListContainer(["a", "b", "a"])
+    first, second, third = container.container_item
+
+    # Equal items are removed by identity, not by value.
+    container.remove_item(None, third)
+    assert container.container_item == ["a", "b"]
+    assert container.container_item[0] is first
+
+    container.remove_item(None, first)
+    assert container.container_item == ["b"]
+    assert container.container_item[0] is second
+
+
+def test_lens_object_rollback():
+    class Person(LensObject):
+        pass
+
+    person = Person()
+    person.name = enable_meta_data("nick")
+    person.name._meta_data.label = "name"
+
+    state = person._get_state()
+    surname = enable_meta_data("blundell")
+    surname._meta_data.label = "Last Name"
+    person.store_item(surname, None, None)
+    person.remove_item(None, person.name)
+    assert person.last_name == "blundell"
+    assert "name" not in person.__dict__
+
+    person._set_state(state)
+    assert person.name == "nick"
+    assert "last_name" not in person.__dict__
+
+
+def test_attribute_names():
+    class Person(LensObject):
+        surname = Attribute()
+        name = Attribute()
+
+    class Animal(LensObject):
+        pass
+
+    # Declared attributes are given in declaration order.
+    assert Person()._get_attribute_names() == ("surname", "name")
+
+    # Otherwise, any public attribute set on the instance.
+    animal = Animal()
+    animal.legs = 4
+    animal._private = True
+    assert animal._get_attribute_names() == ["legs"]
+
+
+def test_list_container_rollback():
+    container = ListContainer.__new__(ListContainer)
+    state = container._get_state()
+    container.store_item(enable_meta_data("a"), None, None)
+    container.store_item(enable_meta_data("b"), None, None)
+    assert container.container_item == ["a", "b"]
+
+    # Roll back to the empty container.
+    container._set_state(state)
+    assert container.container_item == []
+
+    container.store_item(enable_meta_data("a"), None, None)
+    container.store_item(enable_meta_data("b"), None, None)
+    state = container._get_state()
+    container.remove_item(None, container.container_item[0])
+    container.store_item(enable_meta_data("c"), None, None)
+    assert container.container_item == ["b", "c"]
+
+    container._set_state(state)
+    assert container.container_item == ["a", "b"]
+    assert container.get_source_positions(container.container_item) == [
+        LARGE_INTEGER,
+        LARGE_INTEGER,
+    ]
+
+    # Once built, the source positions are kept in step with our items.
+    state = container._get_state()
+    container.remove_item(None, container.container_item[0])
+    item = enable_meta_data("c")
+    item._meta_data.concrete_start_position = 3
+    container.store_item(item, None, None)
+    assert container._positions == [LARGE_INTEGER, 3]
+    container._set_state(state)
+    assert container._positions == [LARGE_INTEGER, LARGE_INTEGER]
+
+
+def test_list_put_is_repeatable():
+    lens = Group(Optional(Literal("a", type=str)) + Literal("b", type=str), type=list)
+    got = lens.get("b")
+    # Rolling back the Optional's failed PUT must not consume the incoming list.
+    assert lens.put(got, "b") == "b"
+    assert got == ["b"]
+    assert lens.put(got) == "b"
+
+
+def test_dict_container():
+    container = DictContainer({"b": "x", "a": "y"})
+    assert container.container_item == ["x", "y"]
+    assert [item._meta_data.label for item in container.container_item] == ["b", "a"]
+    assert container.unwrap() == {"b": "x", "a": "y"}
+
+
+def test_dict_container_static_labels():
+    container = DictContainer({"b": "x", "a": "y"})
+    container._container_lens = Group(Literal("x", type=str), type=dict)
+    container._alignment_mode = SOURCE
+    b_lens = Literal("x", type=str, label="b")
+    c_lens = Literal("x", type=str, label="c")
+
+    # Candidates are looked up by the lens' static label.
+    assert list(container.get_put_candidates(c_lens, None)) == []
+    state = container._get_state()
+    assert container.consume_and_put_item(b_lens, None) == "x"
+    assert container.container_item == ["y"]
+    assert list(container.get_put_candidates(b_lens, None)) == []
+
+    # The index follows a rollback of the container.
+    container._set_state(state)
+    assert list(container.get_put_candidates(b_lens, None)) == ["x"]
+
+
+def test_lens_object_put_is_repeatable():
+    class Person(LensObject):
+        __lens__ = "Person::" + List(
+            KeyValue(Word(alphas, is_label=True) + "=" + Word(alphas, type=str)), ","
+        )
+
+        def __init__(self, name, surname):
+            self.name, self.surname = name, surname
+
+    # Rolling back removed attributes must keep their order, in which new items
+    # are PUT.
+    person = Person("nick", "b")
+    assert put(person) == "Person::name=nick,surname=b"
+    assert person._get_attribute_names() == ["name", "surname"]
+    assert put(person) == "Person::name=nick,surname=b"
+
+
+def test_sub_container_precedence():
+    number = AnyOf(nums, type=int)
+
+    class Numbers(LensObject):
+        __lens__ = Repeat(number, min_count=1)
+        ints = Container(store_items_of_type=[int], type=list)
+        from_lens = Container(store_items_from_lenses=[number], type=list)
+
+    # Where containers match an item by different criteria, the first declared
+    # takes precedence.
+    numbers = get(Numbers, "12")
+    assert numbers.ints == [1, 2]
+    assert numbers.from_lens == []
+
+
+def test_label_mapping_cache_is_bounded():
+    class Thing(LensObject):
+        pass
+
+    thing = Thing()
+    for index in range(_CLASS_CACHE_MAX_SIZE + 10):
+        label = f"label {index}"
+        assert thing.map_label_to_identifier(label) == f"label_{index}"
+        assert thing.map_identifier_to_label(f"other_{index}") == f"other {index}"
+    assert len(Thing._label_to_identifier_cache) == _CLASS_CACHE_MAX_SIZE
+    assert len(Thing._identifier_to_label_cache) == _CLASS_CACHE_MAX_SIZE
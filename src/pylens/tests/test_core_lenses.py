@@ -2,13 +2,16 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import sys
+
 from pytest import raises
 
-from pylens.base_lenses import AnyOf, Group
+from pylens.base_lenses import AnyOf, Group, Literal
 from pylens.charsets import alphas
 from pylens.core_lenses import Forward, Until
 from pylens.debug import d, describe_test
 from pylens.exceptions import InfiniteRecursionException
+from pylens.util_lenses import NewLine, Optional
 
 
 def test_forward():
@@ -44,6 +47,23 @@ def test_forward():
     with raises(InfiniteRecursionException):
         output = lens.put(["k"])
 
+    # The re-entrant PUT is detected directly, rather than by exhausting the
+    # recursion limit.
+    lens = Forward(recursion_limit=100000)
+    lens << "[" + (lens | AnyOf(alphas, type=str)) + "]"
+    lens = Group(lens, type=list)
+    with raises(InfiniteRecursionException) as exc_info:
+        lens.put(["k"])
+    assert len(exc_info.traceback) < 50
+
+    # When CREATing a non-store lens, recursing back into it fails (rather than
+    # recursing forever), and the output is then reused.
+    lens = Forward()
+    lens << "(" + Optional(lens) + ")"
+    assert lens.put() == "()"
+    assert lens._created_output == ("()", None)
+    assert lens.put(None, "((()))") == "((()))"
+
 
 def test_until():
     d("GET")
@@ -63,3 +83,27 @@ def test_until():
 
     # XXX: Perhaps protect against this, or perhaps leave to lens user to worry about?!
     # assert(lens.get(lens.put(["mon)key"])) == ["monkey"])
+
+
+def test_until_first_chars():
+    # The stopping lens is only tried where its first char is found.
+    assert Literal("->")._get_first_chars() == {"-"}
+    assert (Literal("a") | AnyOf("bc"))._get_first_chars() == {"a", "b", "c"}
+    assert NewLine()._get_first_chars() == {"\n"}
+    assert Optional("a")._get_first_chars() is None
+    assert AnyOf("a", negate=True)._get_first_chars() is None
+
+    lens = Group(Until("->", type=str) + "->" + Until("x", type=str), type=list)
+    assert lens.get("a-b->c-d") == ["a-b", "c-d"]
+    lens = Group(Until(NewLine(), type=str) + NewLine(), type=list)
+    assert lens.get("a-b") == ["a-b"]
+    assert lens.get("a-b\n") == ["a-b"]
+    lens = Group(Until(AnyOf("x", negate=True), type=str) + AnyOf(alphas), type=list)
+    assert lens.get("xxy") == ["xx"]
+
+    # Otherwise, the stopping lens' regex may find where it matches.
+    lens = Until(Optional(" ") + "->", type=str)
+    if sys.version_info >= (3, 11):
+        assert lens._get_stop_pattern().pattern.startswith("(?=")
+    lens = Group(lens + " ->", type=list)
+    assert lens.get("a -b ->") == ["a -b"]
@@ -15,3 +15,13 @@ def test_item_meta():
     item._meta_data.monkeys = True
     assert item._meta_data.monkeys is True
     assert item._meta_data.bananas is None
+
+    # Meta data is held in a slot, where the wrapped type allows it.
+    assert not hasattr(item, "__dict__")
+    assert not hasattr(enable_meta_data([1]), "__dict__")
+    assert not hasattr(enable_meta_data({"a": 1}), "__dict__")
+    assert enable_meta_data(1)._meta_data is not None
+
+    # Unset meta data defaults to None, without being stored.
+    assert item._meta_data.label is None
+    assert item._meta_data.unwrap() == {"monkeys": True}
@@ -42,3 +42,20 @@ def test_readers():
 
     cloned_reader.position += 1
     assert not cloned_reader.is_aligned_with(concrete_reader)
+
+    # Only the start of the remaining input is displayed.
+    concrete_reader = ConcreteInputReader("AB" + "C" * 1000)
+    concrete_reader.consume_char()
+    assert str(concrete_reader) == "'BCCCCCCCCC...'"
+    concrete_reader.position = 997
+    assert str(concrete_reader) == "'CCCCC'"
+
+
+def test_consume_if_next():
+    concrete_reader = ConcreteInputReader("ABCD")
+    assert concrete_reader.consume_if_next("AB")
+    assert not concrete_reader.consume_if_next("AB")
+    assert not concrete_reader.consume_if_next("CDE")
+    assert concrete_reader.get_remaining() == "CD"
+    assert concrete_reader.consume_if_next("CD")
+    assert concrete_reader.is_fully_consumed()
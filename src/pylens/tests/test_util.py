@@ -3,7 +3,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from pylens.debug import d
-from pylens.util import Properties
+from pylens.util import Properties, escape_for_display, truncate
 
 
 def test_properties():
@@ -13,3 +13,16 @@ def test_properties():
     properties.something = [1, 2, 3]
     assert properties.something == [1, 2, 3]
     assert properties.nothing is None
+
+    # Copies are shallow, and keep the class.
+    properties_copy = properties.copy()
+    assert type(properties_copy) is Properties
+    assert properties_copy.something is properties.something
+    properties_copy.food = "ham"
+    assert properties.food == "cheese"
+
+
+def test_escape_for_display():
+    assert escape_for_display("") == "[EMPTY]"
+    assert escape_for_display("a\tb\n") == "a[TAB]b[NL]"
+    assert truncate("\n" * 20, max_len=6) == "[NL][N..."
@@ -2,15 +2,26 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import sys
+
 from pytest import raises
 
 from pylens.base_lenses import AnyOf
 from pylens.charsets import alphanums, alphas, nums
 from pylens.debug import assert_equal, d, describe_test
-from pylens.exceptions import LensException
+from pylens.exceptions import LensException, TooFewIterationsException
 from pylens.readers import ConcreteInputReader
 from pylens.settings import GlobalSettings
-from pylens.util_lenses import List, NewLine, OneOrMore, Optional, Whitespace, Word
+from pylens.util_lenses import (
+    BlankLine,
+    HashComment,
+    List,
+    NewLine,
+    OneOrMore,
+    Optional,
+    Whitespace,
+    Word,
+)
 
 
 def test_one_or_more():
@@ -67,6 +78,8 @@ def test_word():
     assert lens.get("w23dffdf3") == "w23df"
     with raises(LensException):
         assert lens.get("1w23dffdf3") == "w23df"
+    with raises(TooFewIterationsException, match="at least 3 chars"):
+        Word(alphas, min_count=3).get("ab1")
 
     d("PUT")
     assert lens.put("R2D2") == "R2D2"
@@ -119,3 +132,57 @@ def test_whitespace():
         lens.get(concrete_input_reader) is None
         and concrete_input_reader.get_remaining() == "xyz"
     )
+
+
+def test_fast_get():
+    # These lenses GET with a regex, which must consume just as their sub-lenses.
+    for lens in (
+        NewLine(),
+        BlankLine(),
+        HashComment(),
+        Word(" a#", max_count=2),
+        Whitespace(" ", indent_continuation=True),
+        Whitespace("", slash_continuation=True),
+    ):
+        for string in (
+            *("", "\n", "  \n", " \t", "x", "#", "#\n", "# a\nb", "#a"),
+            *(" \n", " \n x", "\n\n ", " \\\n ", "\\", " \\x"),
+        ):
+            fast_reader = ConcreteInputReader(string)
+            reader = ConcreteInputReader(string)
+            try:
+                lens.get(fast_reader)
+            except LensException:
+                fast_reader = None
+            try:
+                super(lens.__class__, lens)._get(reader, None)
+            except LensException:
+                reader = None
+            if reader is None:
+                assert fast_reader is None
+            else:
+                assert fast_reader.get_pos() == reader.get_pos()
+
+            # As must their token patterns.
+            match = lens._get_token_pattern().match(string)
+            if match is None:
+                assert fast_reader is None
+            else:
+                assert match.end() == fast_reader.get_pos()
+
+    # A choice of such lenses is matched by one regex.
+    comment, blank_line = HashComment(), BlankLine()
+    lens = comment | blank_line | Word("ab")
+    assert lens._get_lenses_to_try(ConcreteInputReader(" \n")) == (blank_line,)
+    assert lens._get_lenses_to_try(ConcreteInputReader("# x")) == (comment,)
+    assert lens._get_lenses_to_try(ConcreteInputReader("#")) == ()
+
+    # As is a sequence of them, such as a separator (given atomic groups).
+    separator = Whitespace("") + "," + Whitespace("\n  ", indent_continuation=True)
+    if sys.version_info >= (3, 11):
+        assert separator._get_token_pattern() is not None
+    reader = ConcreteInputReader(" ,\n  x")
+    separator.get(reader)
+    assert reader.get_pos() == 5
+    with raises(LensException):
+        separator.get(ConcreteInputReader(" ,x"))
@@ -3,8 +3,6 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-import copy
-
 from .debug import assert_equal, describe_test
 
 
@@ -15,20 +13,23 @@ class Properties:
     """
 
     def __init__(self, **kargs):
-        self.__dict__.update(kargs)
+        # Note, most item meta data starts out empty.
+        if kargs:
+            self.__dict__.update(kargs)
 
     def __getattr__(self, name):
         # This is important, since obj.__dict__ would equal None!
         if name.startswith("__"):
             return super(object, self).__getattr__(name)
 
-        if name in self.__dict__:
-            return self.__dict__[name]
-        else:
-            return None
+        # Note, we are only called if normal lookup (i.e. of __dict__) failed.
+        return None
 
     def copy(self):
-        return copy.copy(self)
+        # Note, this is equivalent to copy.copy(), without its generic dispatch.
+        properties = self.__class__.__new__(self.__class__)
+        properties.__dict__.update(self.__dict__)
+        return properties
 
     def unwrap(self):
         return self.__dict__
@@ -64,13 +65,15 @@ def get_instance_attr(obj, name, default=None):
     return obj_value
 
 
+# Escape newlines so not to confuse debug output (we could also add " ": "[SP]").
+_DISPLAY_ESCAPES = str.maketrans({"\n": "[NL]", "\t": "[TAB]"})
+
+
 def escape_for_display(s):
     """Substitute certain chars to assist debug traces."""
     if len(s) == 0:
         return "[EMPTY]"
-    return s.replace("\n", "[NL]").replace(
-        "\t", "[TAB]"
-    )  # .replace(" ","[SP]") # Escape newlines so not to confuse debug output.
+    return s.translate(_DISPLAY_ESCAPES)
 
 
 def truncate(s, max_len=10):
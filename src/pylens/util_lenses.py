@@ -3,11 +3,13 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-from pylens.base_lenses import And, AnyOf, Empty, Group, Lens, Or, Repeat
-from pylens.charsets import alphanums, alphas
+import re
+
+from pylens.base_lenses import FAILED, And, AnyOf, Empty, Group, Lens, Or, Repeat
+from pylens.charsets import alphanums, alphas, charset_pattern, charset_table
 from pylens.core_lenses import Until
 from pylens.debug import assert_msg
-from pylens.exceptions import LensException
+from pylens.exceptions import LensException, TooFewIterationsException
 from pylens.util import has_value
 
 
@@ -47,9 +49,51 @@ class List(And):
         super().__init__(lens, ZeroOrMore(And(delimiter_lens, lens)), **options)
 
 
-class NewLine(Or):
+class _RegexGetMixin:
+    """
+    For lenses that, as non-store lenses, GET just what a regex matches, so need
+    not GET through their sub-lenses.  The compiled regex is the _get_regex
+    attribute, which a lens declares on its class or sets on its instance (or
+    leaves as None, if it cannot be matched that way).
+    """
+
+    _get_regex = None
+
+    def _get(self, concrete_input_reader, current_container):
+        # As a non-store lens, we need only consume what our regex matches.
+        get_regex = self._get_regex
+        if (
+            self.type is None
+            and get_regex is not None
+            and concrete_input_reader.consume_match(get_regex)
+        ):
+            return None
+        return super()._get(concrete_input_reader, current_container)
+
+    def _try_get(self, concrete_input_reader, current_container=None):
+        # Our regex fails just when our sub-lenses would.
+        get_regex = self._get_regex
+        if self.type is None and get_regex is not None:
+            if concrete_input_reader.consume_match(get_regex):
+                return None
+            return FAILED
+        return super()._try_get(concrete_input_reader, current_container)
+
+    def _get_pattern(self, sub_patterns):
+        if self.type is not None or self._get_regex is None:
+            return None
+        return f"(?>{self._get_regex.pattern})"
+
+    def _get_token_pattern(self):
+        return self._get_regex if self.type is None else None
+
+
+class NewLine(_RegexGetMixin, Or):
     """Matches a newline char or the end of text, so extends the Or lens."""
 
+    # Matches what the lens GETs, when it is a non-store lens.
+    _get_regex = re.compile(r"\n|\Z")
+
     def __init__(self, **options):
         super().__init__("\n", Empty(mode=Empty.END_OF_TEXT), **options)
 
@@ -100,8 +144,56 @@ class Word(And):
 
         super().__init__(left_lens, right_lens, **options)
 
+        # Matches the whole word, which we GET as a single token rather than char
+        # by char (built on first use).
+        self._token_pattern = None
 
-class Whitespace(Or):
+    def _get(self, concrete_input_reader, current_container):
+        token_pattern = self._get_token_pattern()
+        match = token_pattern.match(
+            concrete_input_reader.string, concrete_input_reader.position
+        )
+        if match is None:
+            # Fail as GETting char by char would, had the body chars run short.
+            init_lens, body_lens = self.lenses
+            string = concrete_input_reader.string
+            position = concrete_input_reader.position
+            if position < len(string) and init_lens._is_valid_char(string[position]):
+                raise TooFewIterationsException(
+                    f"Expected at least {body_lens.min_count + 1} chars of a word "
+                    f"matching {token_pattern.pattern!r}"
+                )
+            raise LensException(f"Expected a word matching {token_pattern.pattern!r}")
+        concrete_input_reader.position = match.end()
+
+        # As a STORE lens, Lens.get() casts the token to our (list) type, which is
+        # then combined back into a string, as if we had GOT it char by char.
+        if self.type is not None:
+            return match.group()
+        return None
+
+    def _create_lens_container(self):
+        # Since we GET the whole token, we need no container for its chars.
+        return None
+
+    def _get_pattern(self, sub_patterns):
+        if self.type is not None:
+            return None
+        return f"(?>{self._get_token_pattern().pattern})"
+
+    def _get_token_pattern(self):
+        if self._token_pattern is None:
+            init_lens, body_lens = self.lenses
+            init_pattern = init_lens._get_char_pattern() or "(?!)"
+            body_pattern = body_lens.lenses[0]._get_char_pattern() or "(?!)"
+            max_count = body_lens.max_count if has_value(body_lens.max_count) else ""
+            self._token_pattern = re.compile(
+                f"{init_pattern}{body_pattern}{{{body_lens.min_count},{max_count}}}"
+            )
+        return self._token_pattern
+
+
+class Whitespace(_RegexGetMixin, Or):
     """
     Whitespace helper lens, that knows how to handle (logically) continued lines with '\\n'
     or that preclude an indent which are useful for certain config files.
@@ -153,6 +245,24 @@ class Whitespace(Or):
         options["default"] = default
         super().__init__(*or_lenses, **options)
 
+        # Matches what the lens GETs, so we need not try each of our lenses in
+        # turn.  Note, we need this to match just as our lenses would, without
+        # backtracking into the spaces, so we leave the spaces alone if they may
+        # include the chars that follow them in a continuation.
+        char_pattern = charset_pattern(charset_table(space_chars))
+        if char_pattern is None or "\\" in space_chars or "\n" in space_chars:
+            self._get_regex = None
+        else:
+            patterns = []
+            if slash_continuation:
+                patterns.append(f"{char_pattern}*\\\\\n{char_pattern}*")
+            if indent_continuation:
+                patterns.append(f"{char_pattern}*\n{char_pattern}+")
+            patterns.append(f"{char_pattern}+")
+            if default == "" or optional:
+                patterns.append("")
+            self._get_regex = re.compile("|".join(patterns))
+
 
 WS = Whitespace  # Abreviation.
 
@@ -190,11 +300,14 @@ class KeyValue(Group):
         super().__init__(*args, **options)
 
 
-class BlankLine(And):
+class BlankLine(_RegexGetMixin, And):
     """
     Matches a blank line (i.e. optional whitespace followed by NewLine().
     """
 
+    # Matches what the lens GETs, when it is a non-store lens.
+    _get_regex = re.compile(r"[ \t]*(?:\n|\Z)")
+
     def __init__(self, **options):
         super().__init__(WS(""), NewLine(), **options)
 
@@ -230,8 +343,12 @@ class AutoGroup(Group):
         self.extend_sublenses([lens])
 
 
-class HashComment(And):
+class HashComment(_RegexGetMixin, And):
     """A common hash comment."""
 
+    # Matches what the lens GETs, when it is a non-store lens (note, Until must
+    # GET at least one char).
+    _get_regex = re.compile(r"#[^\n]+(?:\n|\Z)")
+
     def __init__(self, **options):
         super().__init__("#", Until(NewLine()), NewLine(), **options)